@@ -0,0 +1,27 @@
+"""Benchmarks for django-service-objects"""
+
+
+def setup():
+    """
+    Configures Django with the ``tests`` app on an in-memory SQLite
+    database and creates its tables.
+    """
+    import django
+    from django.conf import settings
+    from django.core.management import call_command
+
+    if settings.configured:
+        return
+
+    settings.configure(
+        DATABASES={
+            'default': {
+                'ENGINE': 'django.db.backends.sqlite3',
+                'NAME': ':memory:'
+            }
+        },
+        INSTALLED_APPS=('tests',),
+        ALLOWED_HOSTS=['testserver'],
+    )
+    django.setup()
+    call_command('migrate', run_syncdb=True, verbosity=0)
@@ -0,0 +1,60 @@
+"""
+Runs the benchmark suite::
+
+    python -m benchmarks                        # run everything
+    python -m benchmarks -k model_field         # run matching benchmarks
+    python -m benchmarks --save baseline.json   # save results
+    python -m benchmarks --compare baseline.json
+"""
+import argparse
+import sys
+
+from . import setup
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks')
+    parser.add_argument('-k', dest='keyword', default='',
+                        help='only run benchmarks whose name contains this')
+    parser.add_argument('-n', '--number', type=int, default=1000,
+                        help='calls per benchmark (default: 1000)')
+    parser.add_argument('--save', metavar='PATH',
+                        help='save results as a JSON baseline')
+    parser.add_argument('--compare', metavar='PATH',
+                        help='compare ops/sec against a saved baseline')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help='slowdown %% reported as a regression when '
+                             'comparing (default: 10)')
+    args = parser.parse_args(argv)
+
+    setup()
+    from . import harness
+    from .cases import BENCHMARKS
+
+    baseline = harness.load(args.compare) if args.compare else {}
+    results = {}
+    regressions = []
+
+    print(harness.format_header(compare=bool(baseline)))
+    for benchmark in BENCHMARKS:
+        if args.keyword not in benchmark.name:
+            continue
+        result = harness.measure(benchmark, number=args.number)
+        results[benchmark.name] = result
+
+        base = baseline.get(benchmark.name)
+        print(harness.format_row(benchmark.name, result, base))
+        if base and harness.change(result, base) < -args.threshold:
+            regressions.append(benchmark.name)
+
+    if args.save:
+        harness.save(results, args.save)
+
+    if regressions:
+        print('\nRegressions: {}'.format(', '.join(regressions)))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
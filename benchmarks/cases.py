@@ -0,0 +1,142 @@
+import datetime
+
+from django import forms
+from django.test import RequestFactory
+
+from service_objects.celery_services import CeleryService
+from service_objects.fields import (ModelField, MultipleFormField,
+                                    MultipleModelField)
+from service_objects.services import Service, ModelService
+from service_objects.views import ServiceView
+from tests.forms import FooForm
+from tests.models import CustomFooModel, FooModel
+
+from .harness import Benchmark
+
+
+class CreateFoo(Service):
+    one = forms.CharField(max_length=1)
+    name = forms.CharField(max_length=30)
+    email = forms.EmailField()
+    count = forms.IntegerField()
+
+    def process(self):
+        return self.cleaned_data
+
+
+class CreateFooNoTransaction(CreateFoo):
+    db_transaction = False
+
+
+class CreateFooModelService(ModelService):
+    class Meta:
+        model = FooModel
+        fields = '__all__'
+
+    def process(self):
+        return self.cleaned_data
+
+
+class FooCeleryService(CeleryService):
+    foo = ModelField(CustomFooModel)
+    foos = MultipleModelField(FooModel)
+    date = forms.DateField()
+    text = forms.CharField()
+
+    def process(self):
+        pass
+
+
+class CreateFooView(ServiceView):
+    service_class = CreateFoo
+    success_url = '/done/'
+
+
+SERVICE_INPUTS = {
+    'one': 'a',
+    'name': 'John Smith',
+    'email': 'john@example.com',
+    'count': 3,
+}
+
+
+def foos(count):
+    existing = FooModel.objects.count()
+    if existing < count:
+        FooModel.objects.bulk_create(
+            FooModel(one='a') for _ in range(count - existing))
+    return list(FooModel.objects.all()[:count])
+
+
+def setup_model_field(count):
+    def setup():
+        objects = foos(count)
+        if count == 1:
+            return ModelField(FooModel), objects[0]
+        return MultipleModelField(FooModel), objects
+    return setup
+
+
+def setup_multiple_form_field(count, bulk=False):
+    def setup():
+        items = [{'name': 'n{}'.format(i % 1000)} for i in range(count)]
+        return MultipleFormField(FooForm, max_count=None, bulk=bulk), items
+    return setup
+
+
+def setup_celery():
+    foo, _ = CustomFooModel.objects.get_or_create(custom_pk='bench', one='a')
+    service = FooCeleryService({
+        'foo': foo,
+        'foos': foos(10),
+        'date': datetime.date.today(),
+        'text': 'text',
+    })
+    service.service_clean()
+    return (service.cleaned_data,)
+
+
+def setup_celery_inflate():
+    cleaned_data, = setup_celery()
+    return (FooCeleryService._deflate_models(cleaned_data),)
+
+
+def setup_view():
+    request = RequestFactory().post('/', SERVICE_INPUTS)
+    form = CreateFoo(SERVICE_INPUTS)
+    form.is_valid()
+
+    def form_valid():
+        view = CreateFooView()
+        view.setup(request)
+        return view.form_valid(form)
+
+    return (form_valid,)
+
+
+def clean(field, value):
+    return field.clean(value)
+
+
+BENCHMARKS = [
+    Benchmark('service.execute',
+              lambda: CreateFoo.execute(SERVICE_INPUTS)),
+    Benchmark('service.execute[db_transaction=False]',
+              lambda: CreateFooNoTransaction.execute(SERVICE_INPUTS)),
+    Benchmark('model_service.execute',
+              lambda: CreateFooModelService.execute({'one': 'a'})),
+    Benchmark('model_field.clean[1]', clean, setup_model_field(1)),
+    Benchmark('multiple_model_field.clean[100]', clean,
+              setup_model_field(100)),
+    Benchmark('multiple_model_field.clean[10000]', clean,
+              setup_model_field(10000), number=50),
+    Benchmark('multiple_form_field.clean[1000]', clean,
+              setup_multiple_form_field(1000), number=20),
+    Benchmark('multiple_form_field.clean[1000, bulk]', clean,
+              setup_multiple_form_field(1000, bulk=True), number=20),
+    Benchmark('celery_service._deflate_models',
+              FooCeleryService._deflate_models, setup_celery),
+    Benchmark('celery_service._inflate_models',
+              FooCeleryService._inflate_models, setup_celery_inflate),
+    Benchmark('service_view.form_valid', lambda view: view(), setup_view),
+]
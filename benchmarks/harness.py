@@ -0,0 +1,105 @@
+import gc
+import json
+import time
+import tracemalloc
+
+PERCENTILES = (50, 90, 99)
+
+
+class Benchmark(object):
+    """
+    A named callable to measure.  ``setup`` is called once before measuring
+    and returns the arguments passed to ``func`` on every call.
+    """
+    def __init__(self, name, func, setup=None, number=None):
+        self.name = name
+        self.func = func
+        self.setup = setup
+        self.number = number
+
+
+def percentile(sorted_values, pct):
+    index = int(round(pct / 100.0 * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+def measure(benchmark, number=1000, warmup=10):
+    """
+    Runs ``benchmark`` and returns a dictionary with its ops/sec, latency
+    percentiles (in microseconds) and memory allocated per call.
+    """
+    number = benchmark.number or number
+    args = benchmark.setup() if benchmark.setup else ()
+    func = benchmark.func
+
+    for _ in range(warmup):
+        func(*args)
+
+    timings = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        clock = time.perf_counter
+        total_start = clock()
+        for _ in range(number):
+            start = clock()
+            func(*args)
+            timings.append(clock() - start)
+        total = clock() - total_start
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        func(*args)
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    timings.sort()
+    result = {
+        'number': number,
+        'ops': number / total,
+        'peak_kib': (peak - before) / 1024.0,
+        'retained_kib': (after - before) / 1024.0,
+    }
+    for pct in PERCENTILES:
+        result['p%d_us' % pct] = percentile(timings, pct) * 1e6
+    return result
+
+
+def format_row(name, result, baseline=None):
+    row = '{:<40} {:>12.1f} {:>10.1f} {:>10.1f} {:>10.1f} {:>10.1f}'.format(
+        name, result['ops'], result['p50_us'], result['p90_us'],
+        result['p99_us'], result['peak_kib'])
+    if baseline is not None:
+        row += ' {:>+9.1f}%'.format(change(result, baseline))
+    return row
+
+
+def format_header(compare=False):
+    header = '{:<40} {:>12} {:>10} {:>10} {:>10} {:>10}'.format(
+        'benchmark', 'ops/sec', 'p50 us', 'p90 us', 'p99 us', 'peak KiB')
+    if compare:
+        header += ' {:>10}'.format('vs base')
+    return header
+
+
+def change(result, baseline):
+    """
+    Percentage change of ops/sec against ``baseline``; negative values are
+    slowdowns.
+    """
+    return (result['ops'] / baseline['ops'] - 1) * 100
+
+
+def save(results, path):
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
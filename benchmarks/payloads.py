@@ -0,0 +1,85 @@
+"""
+Compares the size and encoding throughput of ``CeleryService`` task
+payloads sent with pickle (the default) and with the JSON codec::
+
+    python -m benchmarks.payloads
+"""
+import datetime
+import decimal
+import timeit
+import uuid
+
+from . import setup
+
+setup()
+
+from kombu.serialization import dumps, loads  # noqa: E402
+
+from service_objects.codecs import get_codec  # noqa: E402
+from tests.models import FooModel  # noqa: E402
+
+from .cases import FooCeleryService  # noqa: E402
+
+
+def pickle_message(cleaned_data):
+    return dumps(((cleaned_data,), {'service_class': FooCeleryService}),
+                 serializer='pickle')
+
+
+def json_message(cleaned_data):
+    payload = get_codec('json').encode(
+        FooCeleryService.get_service_key(), cleaned_data)
+    return dumps(((payload,), {'codec': 'json'}), serializer='json')
+
+
+def pickle_decode(message):
+    args, kwargs = loads(message[2], message[0], message[1],
+                         accept=[message[0]])
+    return args[0]
+
+
+def json_decode(message):
+    (payload,), kwargs = loads(message[2], message[0], message[1],
+                               accept=[message[0]])
+    return get_codec('json').decode(payload)[1]
+
+
+def main(number=2000):
+    FooModel.objects.bulk_create(FooModel(one='a') for _ in range(100))
+    foos = list(FooModel.objects.all())
+    cases = {
+        'scalars': {
+            'date': datetime.date.today(),
+            'amount': decimal.Decimal('12.50'),
+            'token': uuid.uuid4(),
+            'text': 'text',
+        },
+        'model': {'foo': (FooModel, foos[0].pk), 'text': 'text'},
+        '100 models': {'foos': FooCeleryService._deflate_model(foos)},
+        'nested': {
+            'rows': [
+                {'date': datetime.date.today(), 'n': i, 'tags': ['a', 'b']}
+                for i in range(100)
+            ],
+        },
+    }
+
+    print('{:<12} {:>12} {:>12} {:>14} {:>14}'.format(
+        'payload', 'pickle B', 'json B', 'pickle ops/s', 'json ops/s'))
+    for name, cleaned_data in cases.items():
+        pickled = pickle_message(cleaned_data)
+        encoded = json_message(cleaned_data)
+        assert json_decode(encoded) == pickle_decode(pickled)
+
+        pickle_time = timeit.timeit(
+            lambda: pickle_decode(pickle_message(cleaned_data)),
+            number=number)
+        json_time = timeit.timeit(
+            lambda: json_decode(json_message(cleaned_data)), number=number)
+        print('{:<12} {:>12} {:>12} {:>14.0f} {:>14.0f}'.format(
+            name, len(pickled[2]), len(encoded[2]),
+            number / pickle_time, number / json_time))
+
+
+if __name__ == '__main__':
+    main()
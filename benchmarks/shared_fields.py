@@ -0,0 +1,65 @@
+"""
+Compares the per-call overhead of ``Service.execute`` with and without
+``share_fields``::
+
+    python -m benchmarks.shared_fields
+"""
+import timeit
+
+from . import setup
+
+setup()
+
+from django import forms  # noqa: E402
+
+from service_objects.fields import ModelField, MultipleFormField  # noqa
+from service_objects.services import Service  # noqa: E402
+from tests.forms import FooForm  # noqa: E402
+from tests.models import FooModel  # noqa: E402
+
+
+class CopiedFieldsService(Service):
+    db_transaction = False
+
+    foo = ModelField(FooModel)
+    name = forms.CharField(max_length=30)
+    email = forms.EmailField()
+    count = forms.IntegerField()
+    items = MultipleFormField(FooForm, required=False)
+
+    def process(self):
+        pass
+
+
+class SharedFieldsService(CopiedFieldsService):
+    share_fields = True
+
+
+def main(number=20000, repeat=5):
+    foo = FooModel(one='a')
+    foo.pk = 1
+    inputs = {
+        'foo': foo,
+        'name': 'John Smith',
+        'email': 'john@example.com',
+        'count': 3,
+    }
+
+    timings = {}
+    for service_class in (CopiedFieldsService, SharedFieldsService):
+        best = min(timeit.repeat(
+            lambda: service_class.execute(inputs),
+            number=number,
+            repeat=repeat,
+        ))
+        timings[service_class] = best / number * 1e6
+        print('{:<22} {:8.2f} us/call'.format(
+            service_class.__name__, timings[service_class]))
+
+    saved = timings[CopiedFieldsService] - timings[SharedFieldsService]
+    print('{:<22} {:8.2f} us/call ({:.1f}%)'.format(
+        'saving', saved, saved / timings[CopiedFieldsService] * 100))
+
+
+if __name__ == '__main__':
+    main()
@@ -9,6 +9,10 @@ settings.configure(
         'default': {
             'ENGINE': 'django.db.backends.sqlite3',
             'NAME': ':memory:'
+        },
+        'replica': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': ':memory:'
         }
     },
     INSTALLED_APPS=('tests',)
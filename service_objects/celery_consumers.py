@@ -0,0 +1,144 @@
+import logging
+import socket
+from time import monotonic
+
+from django.core.exceptions import ImproperlyConfigured
+from kombu import Queue
+
+from .codecs import get_codec
+
+logger = logging.getLogger(__name__)
+
+
+class BatchConsumer(object):
+    """
+    Runs the queued tasks of a :class:`CeleryService` in batches, instead
+    of one task per message as Celery workers do.  Every batch takes up to
+    ``batch_size`` messages from the Service's queue, waiting at most
+    ``timeout`` seconds for them, fetches the models of all of them with
+    one query per model class, and executes them in a single transaction
+    where each item has its own savepoint::
+
+        consumer = BatchConsumer(TouchRowService, batch_size=200)
+        with app.connection_for_read() as connection:
+            consumer.run(connection)
+
+    The Service needs :attr:`CeleryService.task_options` with a ``queue``
+    used by its task only.  Messages are acknowledged once the transaction
+    commits, including those of failed items, which are logged; messages
+    of other tasks are rejected and requeued.  Results are not stored in
+    the result backend.
+
+    :param service_class: the :class:`CeleryService` subclass to run.
+
+    :param int batch_size: maximum number of messages per batch.
+
+    :param float timeout: maximum number of seconds to wait for a batch
+        to fill up.
+
+    :param string queue: name of the queue to consume, by default the
+        ``queue`` task option of the Service.
+    """
+    def __init__(self, service_class, batch_size=100, timeout=0.1,
+                 queue=None):
+        if service_class._task is None:
+            raise ImproperlyConfigured(
+                '{} needs task_options to be consumed in batches'.format(
+                    service_class.__name__))
+        if batch_size < 1:
+            raise ValueError('batch_size must be a positive integer')
+
+        self.service_class = service_class
+        self.batch_size = batch_size
+        self.timeout = timeout
+        if queue is None:
+            queue = service_class.task_options.get('queue')
+        if queue is None:
+            raise ImproperlyConfigured(
+                '{} task_options have no queue'.format(
+                    service_class.__name__))
+        self.queue = Queue(queue)
+
+    def fetch(self, connection):
+        """
+        Returns the next batch of messages from the queue; an empty list
+        if none arrived within ``timeout``.
+        """
+        messages = []
+        deadline = monotonic() + self.timeout
+
+        with connection.Consumer(
+            [self.queue], on_message=messages.append,
+            accept=[self._accept()],
+            prefetch_count=self.batch_size,
+        ):
+            while len(messages) < self.batch_size:
+                remaining = deadline - monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    connection.drain_events(timeout=remaining)
+                except socket.timeout:
+                    break
+        return messages
+
+    def _accept(self):
+        if self.service_class.payload_codec is None:
+            return 'pickle'
+        return get_codec(self.service_class.payload_codec).serializer
+
+    def decode(self, message):
+        """
+        Returns the list of deflated ``cleaned_data`` carried by
+        ``message``.
+        """
+        args, kwargs, embed = message.decode()
+        payload = args[0]
+        codec = kwargs.get('codec')
+        if codec is not None:
+            service_key, payload = get_codec(codec).decode(payload)
+        if kwargs.get('many'):
+            return list(payload)
+        return [payload]
+
+    def drain(self, connection):
+        """
+        Fetches and executes one batch.  Returns the list of
+        :class:`BatchResult` of its items.
+        """
+        task_name = self.service_class._task.name
+        messages = []
+        chunk = []
+        for message in self.fetch(connection):
+            if message.headers.get('task') != task_name:
+                message.reject(requeue=True)
+                continue
+            messages.append(message)
+            chunk.extend(self.decode(message))
+
+        if not chunk:
+            return []
+        try:
+            results = self.service_class._inflate_and_execute_isolated(chunk)
+        except Exception:
+            for message in messages:
+                message.reject(requeue=True)
+            raise
+
+        for message in messages:
+            message.ack()
+        for result in results:
+            if result.error is not None:
+                logger.error(
+                    '%s failed', self.service_class.__name__,
+                    exc_info=(type(result.error), result.error,
+                              result.error.__traceback__))
+        return results
+
+    def run(self, connection, should_stop=None):
+        """
+        Executes batches until ``should_stop``, a callable, returns
+        ``True``; forever by default.
+        """
+        while should_stop is None or not should_stop():
+            self.drain(connection)
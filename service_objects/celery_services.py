@@ -1,8 +1,32 @@
-from celery import shared_task
+from collections import defaultdict
+from collections.abc import MutableMapping
+from contextlib import nullcontext
+from itertools import islice
 
-from django.db import models
+from celery import group, shared_task
 
-from .services import Service
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import models, transaction
+from django.db.models.query import QuerySet
+
+from .codecs import get_codec
+from .services import BatchResult, Service
+
+_services = {}
+
+
+def get_service_class(service_key):
+    """
+    Returns the :class:`CeleryService` registered as ``service_key``
+    (see :meth:`CeleryService.get_service_key`).  Its module has to be
+    imported already: keys come from the broker, so nothing is imported
+    on their behalf.
+    """
+    try:
+        return _services[service_key]
+    except KeyError:
+        raise LookupError(
+            'No CeleryService registered as {!r}'.format(service_key))
 
 
 @shared_task
@@ -13,14 +37,289 @@ def celery_service_task(cleaned_data, service_class=None):
     service_class._inflate_and_execute(cleaned_data)
 
 
+@shared_task
+def celery_service_payload_task(payload, codec='json'):
+    """
+    Task for dispatching `CeleryService`s execution to, for services
+    sending their inputs with a :attr:`CeleryService.payload_codec`.
+    """
+    service_key, cleaned_data = get_codec(codec).decode(payload)
+    get_service_class(service_key)._inflate_and_execute(cleaned_data)
+
+
+@shared_task
+def celery_service_chunk_task(chunk, service_class=None, codec=None):
+    """
+    Task running a chunk of `CeleryService` executions dispatched by
+    :meth:`CeleryService.execute_many`.
+    """
+    if codec is not None:
+        service_key, chunk = get_codec(codec).decode(chunk)
+        service_class = get_service_class(service_key)
+    service_class._inflate_and_execute_many(chunk)
+
+
+def register_service_task(service_class):
+    """
+    Registers the task running the executions of ``service_class``, a
+    :class:`CeleryService` with :attr:`CeleryService.task_options`.  The
+    task is named after the Service unless the options have a ``name``.
+    """
+    options = dict(service_class.task_options)
+    options.setdefault('name', '{}.{}'.format(
+        service_class.__module__, service_class.__qualname__))
+
+    def run(payload, codec=None, many=False):
+        if codec is not None:
+            service_key, payload = get_codec(codec).decode(payload)
+        if many:
+            service_class._inflate_and_execute_many(payload)
+        else:
+            service_class._inflate_and_execute(payload)
+
+    return shared_task(**options)(run)
+
+
+class OnCommitMarker(object):
+    """
+    ``on_commit`` callback marking a task queued by
+    :func:`publish_on_commit` as committed.  It is discarded with the
+    task's savepoint if that is rolled back.
+    """
+    __slots__ = ('committed',)
+
+    def __init__(self):
+        self.committed = False
+
+    def __call__(self):
+        self.committed = True
+
+
+class OnCommitPublisher(object):
+    """
+    ``on_commit`` callback publishing the tasks queued during a
+    transaction by :func:`publish_on_commit`, using a single producer.
+    It is kept after the markers of its tasks, so it runs once they
+    have all been marked.
+    """
+    def __init__(self):
+        self.queued = []
+
+    def queue(self, signature):
+        marker = OnCommitMarker()
+        self.queued.append((marker, signature))
+        return marker
+
+    def __call__(self):
+        signatures = [
+            signature for marker, signature in self.queued if marker.committed
+        ]
+        self.queued = []
+        if not signatures:
+            return
+        with signatures[0].app.producer_or_acquire() as producer:
+            for signature in signatures:
+                signature.apply_async(producer=producer)
+
+
+def publish_on_commit(signature, using=None):
+    """
+    Publishes ``signature`` once the transaction of the ``using`` database
+    commits; right away outside of transactions.  Tasks queued in the same
+    transaction are sent together after it commits, and tasks queued in a
+    savepoint that is rolled back are dropped.
+    """
+    connection = transaction.get_connection(using)
+    if not connection.in_atomic_block:
+        signature.apply_async()
+        return
+
+    publisher = _pop_publisher(connection)
+    if publisher is None:
+        publisher = OnCommitPublisher()
+
+    connection.on_commit(publisher.queue(signature))
+    # Registered outside of any savepoint, so that it is only dropped with
+    # the whole transaction.
+    _on_commit_outside_savepoints(connection, publisher)
+
+
+def _pop_publisher(connection):
+    """
+    Removes the :class:`OnCommitPublisher` of the current transaction
+    from the ``on_commit`` hooks of ``connection`` and returns it, or
+    ``None``.  It is moved to the end of the hooks on every call of
+    :func:`publish_on_commit`, so it is searched from there.
+    """
+    hooks = connection.run_on_commit
+    for index in range(len(hooks) - 1, -1, -1):
+        if isinstance(hooks[index][1], OnCommitPublisher):
+            return hooks.pop(index)[1]
+    return None
+
+
+def _on_commit_outside_savepoints(connection, func):
+    """
+    Registers ``func`` to run once the transaction of ``connection``
+    commits, even if the current savepoints are rolled back.
+
+    Django has no API for this: it relies on the private
+    ``connection.run_on_commit`` entries, ``(sids, func, robust)`` tuples
+    (``(sids, func)`` before Django 4.2) where ``sids`` are the savepoints
+    whose rollback drops the hook.
+    """
+    connection.on_commit(func)
+    entry = connection.run_on_commit.pop()
+    connection.run_on_commit.append((set(),) + tuple(entry[1:]))
+
+
+class LazyModelDict(MutableMapping):
+    """
+    ``cleaned_data`` of a :class:`CeleryService` using ``lazy_inflation``.
+    Deflated models stay as they are until read; reading one inflates the
+    pending values of the same model class together.  Values are read
+    through :meth:`__getitem__` even when the mapping is copied or
+    unpacked with ``**``.
+    """
+    def __init__(self, service_class, cleaned_data):
+        self._data = dict(cleaned_data)
+        self._service_class = service_class
+        self._pending = {
+            key: value for key, value in self._data.items()
+            if service_class._is_deflated(value)
+        }
+
+    def _inflate(self, model_class=None):
+        """
+        Inflates pending values of ``model_class``, or all of them.
+        """
+        pending = {
+            key: value for key, value in self._pending.items()
+            if model_class is None or value[0] is model_class
+        }
+        service_class = self._service_class
+        fetched = service_class._fetch_models(
+            service_class._collect_references(pending))
+        for key, value in pending.items():
+            self._data[key] = service_class._inflate_value(value, fetched)
+            del self._pending[key]
+
+    def __getitem__(self, key):
+        if key in self._pending:
+            self._inflate(self._pending[key][0])
+        return self._data[key]
+
+    def __setitem__(self, key, value):
+        self._pending.pop(key, None)
+        self._data[key] = value
+
+    def __delitem__(self, key):
+        self._pending.pop(key, None)
+        del self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def values(self):
+        self._inflate()
+        return self._data.values()
+
+    def items(self):
+        self._inflate()
+        return self._data.items()
+
+    def copy(self):
+        self._inflate()
+        return dict(self._data)
+
+    def __repr__(self):
+        self._inflate()
+        return repr(self._data)
+
+
 class CeleryService(Service):
+    """
+    A :class:`Service` whose :meth:`process` runs in a Celery worker.
+    Model instances in ``cleaned_data`` are sent as ``(model_class, pk)``
+    references, and lists or querysets of them (e.g. from a
+    :class:`MultipleModelField`) as ``(model_class, [pks])``.  The worker
+    fetches them again, in order, with one query per model class.
+
+    :cvar dictionary select_related: ``select_related`` lookups applied
+        when fetching the model of each field on the worker, e.g.
+        ``{'booking': ['customer']}``.
+
+    :cvar dictionary prefetch_related: ``prefetch_related`` lookups
+        applied when fetching the model of each field on the worker.
+
+    :cvar boolean lazy_inflation: keep models deflated until
+        ``cleaned_data`` is first accessed on the worker.  Reading any
+        model field fetches the pending objects of its model class with
+        one query, so tasks that don't use their models make no queries.
+        Default is False.
+
+    :cvar string payload_codec: name of the codec used to send
+        ``cleaned_data`` to the worker, e.g. ``'json'`` (see
+        :mod:`service_objects.codecs`).  By default, ``cleaned_data`` and
+        the Service class itself are pickled.
+
+    :cvar boolean dispatch_on_commit: send tasks once the transaction of
+        the ``using`` database commits, instead of right away, so workers
+        don't run before the rows they use are visible.  Tasks sent in
+        the same transaction are published together.  Default is False.
+
+    :cvar dictionary task_options: options of a task registered for this
+        Service only, e.g. ``{'queue': 'bookings', 'rate_limit': '10/s',
+        'acks_late': True}``, so it can be routed and run by its own
+        workers.  Subclasses inheriting the options get their own task too.
+        By default, all Services share the generic tasks.
+    """
+    select_related = {}
+    prefetch_related = {}
+    lazy_inflation = False
+    payload_codec = None
+    dispatch_on_commit = False
+    task_options = None
+    _task = None
+
+    def __init_subclass__(cls, **kwargs):
+        super(CeleryService, cls).__init_subclass__(**kwargs)
+        _services[cls.get_service_key()] = cls
+        cls._task = None
+        if cls.task_options is not None:
+            cls._task = register_service_task(cls)
+
+    @classmethod
+    def get_service_key(cls):
+        """
+        Returns the key identifying the Service in task payloads.
+        """
+        return '{}:{}'.format(cls.__module__, cls.__qualname__)
+
     @staticmethod
     def _deflate_model(value):
         """
-        Transforms model instances into picklable tuple.
+        Transforms model instances into picklable tuple.  Lists, tuples
+        and querysets of saved instances of a single model become a
+        ``(model_class, [pks])`` tuple.
         """
         if isinstance(value, models.Model):
             return value.__class__, value.pk
+        if isinstance(value, QuerySet):
+            return value.model, list(value.values_list('pk', flat=True))
+        if isinstance(value, (list, tuple)) and value:
+            model_class = type(value[0])
+            if issubclass(model_class, models.Model) and all(
+                type(item) is model_class and item.pk is not None
+                for item in value
+            ):
+                return model_class, [item.pk for item in value]
         return value
 
     @staticmethod
@@ -33,6 +332,9 @@ class CeleryService(Service):
             if isinstance(model_class, type) and issubclass(
                 model_class, models.Model
             ):  # noqa
+                if isinstance(pk, list):
+                    return CeleryService._inflate_models(
+                        {None: value})[None]
                 return model_class.objects.get(pk=pk)
         return value
 
@@ -43,12 +345,110 @@ class CeleryService(Service):
             for key, value in cleaned_data.items()  # noqa
         }
 
+    @staticmethod
+    def _is_deflated(value):
+        return (
+            isinstance(value, tuple) and len(value) == 2
+            and isinstance(value[0], type)
+            and issubclass(value[0], models.Model)
+        )
+
+    @classmethod
+    def _get_inflate_queryset(cls, model_class, keys):
+        """
+        Returns the queryset used to fetch ``model_class`` objects referenced
+        by the ``cleaned_data`` ``keys``, applying the
+        :attr:`select_related` and :attr:`prefetch_related` hints of
+        those keys.
+        """
+        queryset = model_class.objects.all()
+        select_related = [
+            lookup for key in keys for lookup in cls.select_related.get(key, ())
+        ]
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        prefetch_related = [
+            lookup
+            for key in keys for lookup in cls.prefetch_related.get(key, ())
+        ]
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        return queryset
+
+    @classmethod
+    def _fetch_models(cls, references):
+        """
+        Fetches the objects of ``references``, a dictionary of
+        ``{model_class: {key: set of pks}}``, with one query per model
+        class.  Returns ``{model_class: {pk: instance}}``.
+
+        Raises the model's ``DoesNotExist`` if an object has been deleted.
+        """
+        fetched = {}
+        for model_class, keys in references.items():
+            pks = set().union(*keys.values())
+            queryset = cls._get_inflate_queryset(model_class, list(keys))
+            objects = queryset.in_bulk(list(pks))
+            if len(objects) != len(pks):
+                raise model_class.DoesNotExist(
+                    "%s matching query does not exist."
+                    % model_class._meta.object_name
+                )
+            fetched[model_class] = objects
+        return fetched
+
+    @classmethod
+    def _collect_references(cls, cleaned_data):
+        """
+        Returns the deflated models of ``cleaned_data`` as
+        ``{model_class: {key: set of pks}}``.
+        """
+        references = defaultdict(lambda: defaultdict(set))
+        for key, value in cleaned_data.items():
+            if cls._is_deflated(value):
+                model_class, pk = value
+                if isinstance(pk, list):
+                    references[model_class][key].update(pk)
+                else:
+                    references[model_class][key].add(pk)
+        return references
+
+    @classmethod
+    def _inflate_value(cls, value, fetched):
+        if not cls._is_deflated(value):
+            return value
+        model_class, pk = value
+        if isinstance(pk, list):
+            return [fetched[model_class][item] for item in pk]
+        return fetched[model_class][pk]
+
     @classmethod
     def _inflate_models(cls, cleaned_data):
-        return {
-            key: cls._inflate_model(value)
-            for key, value in cleaned_data.items()  # noqa
-        }
+        if cls.lazy_inflation:
+            return LazyModelDict(cls, cleaned_data)
+        return cls._inflate_many([cleaned_data])[0]
+
+    @classmethod
+    def _inflate_many(cls, items):
+        """
+        Inflates a list of ``cleaned_data`` dictionaries, fetching the
+        models referenced by all of them with one query per model class.
+        """
+        references = defaultdict(lambda: defaultdict(set))
+        for cleaned_data in items:
+            item_references = cls._collect_references(cleaned_data)
+            for model_class, keys in item_references.items():
+                for key, pks in keys.items():
+                    references[model_class][key].update(pks)
+
+        fetched = cls._fetch_models(references)
+        return [
+            {
+                key: cls._inflate_value(value, fetched)
+                for key, value in cleaned_data.items()  # noqa
+            }
+            for cleaned_data in items
+        ]
 
     @classmethod
     def _inflate_and_execute(cls, cleaned_data):
@@ -56,11 +456,127 @@ class CeleryService(Service):
         cleaned_data = cls._inflate_models(cleaned_data)
         setattr(instance, "cleaned_data", cleaned_data)
 
-        with instance._process_context():
-            return instance.process()
+        return instance._run_process()
 
     @classmethod
-    def execute(cls, inputs, files=None, sync=False, **kwargs):
+    def _inflate_and_execute_many(cls, chunk):
+        instances = []
+        for cleaned_data in cls._inflate_many(chunk):
+            instance = cls({})
+            setattr(instance, "cleaned_data", cleaned_data)
+            instances.append(instance)
+
+        with cls._batch_context(instances):
+            cls.process_batch(instances)
+
+    @classmethod
+    def _inflate_and_execute_isolated(cls, chunk):
+        """
+        Same as :meth:`_inflate_and_execute_many`, but every item runs in
+        its own savepoint: an item whose models were deleted or whose
+        :meth:`process` raises is rolled back alone and reported in the
+        :class:`BatchResult` list returned, one per item of ``chunk``.
+        """
+        try:
+            inflated = cls._inflate_many(chunk)
+        except ObjectDoesNotExist:
+            inflated = []
+            for cleaned_data in chunk:
+                try:
+                    inflated.extend(cls._inflate_many([cleaned_data]))
+                except ObjectDoesNotExist as e:
+                    inflated.append(e)
+
+        def atomic():
+            if cls.db_transaction:
+                return transaction.atomic(using=cls.using)
+            return nullcontext()
+
+        results = []
+        instances = []
+
+        def post_process():
+            for instance in instances:
+                instance._post_process_callable()()
+
+        with atomic():
+            for index, cleaned_data in enumerate(inflated):
+                if isinstance(cleaned_data, Exception):
+                    results.append(BatchResult(index, None, cleaned_data))
+                    continue
+                instance = cls({})
+                setattr(instance, "cleaned_data", cleaned_data)
+                try:
+                    with atomic():
+                        result = instance.process()
+                except Exception as e:
+                    results.append(BatchResult(index, None, e))
+                else:
+                    results.append(BatchResult(index, result, None))
+                    instances.append(instance)
+
+            if cls.run_post_process and cls.db_transaction:
+                transaction.on_commit(post_process, using=cls.using)
+
+        if cls.run_post_process and not cls.db_transaction:
+            post_process()
+        return results
+
+    @classmethod
+    def execute_many(cls, inputs, batch_size=100, sync=False, **kwargs):
+        """
+        Dispatches one execution of the Service per item of ``inputs``
+        to Celery, packing ``batch_size`` items into each task.  Every
+        task fetches the models of its whole chunk at once and runs
+        :meth:`process_batch` in a single transaction.
+
+        All inputs are validated before anything is sent; the first
+        invalid item raises :class:`InvalidInputsError`.
+
+        :param iterable inputs: iterable of data dictionaries, each one
+            checked against the fields defined on the Service class.
+
+        :param int batch_size: number of items per task.
+
+        :param bool sync: executes right away as
+            :meth:`Service.execute_many` if `True` (default `False`).
+
+        :param dictionary kwargs: any extra parameters You want pass
+            to celery tasks, or to the Service instances with ``sync``.
+
+        :return: the ``GroupResult`` of the dispatched tasks; with
+            :attr:`dispatch_on_commit`, the tasks are only sent once the
+            transaction commits.  With ``sync``, the list of
+            :class:`BatchResult` of the items.
+        """
+        if sync:
+            return list(super(CeleryService, cls).execute_many(
+                inputs, batch_size=batch_size, on_error='raise', **kwargs))
+        if batch_size < 1:
+            raise ValueError('batch_size must be a positive integer')
+
+        chunks = []
+        items = iter(inputs)
+        while True:
+            chunk = []
+            for data in islice(items, batch_size):
+                instance = cls(data)
+                instance.service_clean()
+                chunk.append(cls._deflate_models(instance.cleaned_data))
+            if not chunk:
+                break
+            chunks.append(cls._task_signature(chunk, many=True))
+
+        signature = group(chunks).set(**kwargs)
+        if cls.dispatch_on_commit:
+            result = signature.freeze()
+            publish_on_commit(signature, using=cls.using)
+            return result
+        return signature.apply_async()
+
+    @classmethod
+    def execute(cls, inputs, files=None, sync=False, savepoint=None,
+                **kwargs):
         """
         Dispatches service excecution to the celery task.
 
@@ -73,6 +589,9 @@ class CeleryService(Service):
         :param bool sync: executes as a normal `Service` if `True`
             (default `False`).
 
+        :param bool savepoint: overrides :attr:`savepoint` when executed
+            with ``sync``.
+
         :param dictionary kwargs: any extra parameters You want pass
             to celery task.
         """
@@ -80,13 +599,40 @@ class CeleryService(Service):
         instance.service_clean()
 
         if sync:
-            with instance._process_context():
-                return instance.process()
+            return instance._run_process(savepoint=savepoint)
+
+        cleaned_data = cls._deflate_models(instance.cleaned_data)
+        signature = cls._task_signature(cleaned_data, **kwargs)
+        if cls.dispatch_on_commit:
+            publish_on_commit(signature, using=cls.using)
         else:
-            cleaned_data = cls._deflate_models(instance.cleaned_data)
-            celery_service_task.apply_async(
-                args=(cleaned_data,),
-                kwargs={"service_class": cls},
-                serializer="pickle",
-                **kwargs
-            )
+            signature.apply_async()
+
+    @classmethod
+    def _task_signature(cls, cleaned_data, many=False, **options):
+        kwargs = {}
+        if cls.payload_codec is None:
+            payload = cleaned_data
+            serializer = "pickle"
+            if cls._task is None:
+                kwargs["service_class"] = cls
+        else:
+            codec = get_codec(cls.payload_codec)
+            payload = codec.encode(cls.get_service_key(), cleaned_data)
+            serializer = codec.serializer
+            kwargs["codec"] = cls.payload_codec
+
+        if cls._task is not None:
+            task = cls._task
+            if many:
+                kwargs["many"] = True
+        elif many:
+            task = celery_service_chunk_task
+        elif cls.payload_codec is None:
+            task = celery_service_task
+        else:
+            task = celery_service_payload_task
+
+        return task.signature(
+            args=(payload,), kwargs=kwargs, serializer=serializer, **options
+        )
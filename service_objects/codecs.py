@@ -0,0 +1,242 @@
+import datetime
+import decimal
+import uuid
+
+from django.apps import apps
+from django.db import models
+
+
+class PickleCodec(object):
+    """
+    Sends ``cleaned_data`` as it is, serialized with pickle.
+    """
+    serializer = 'pickle'
+
+    def encode(self, service_key, cleaned_data):
+        return service_key, cleaned_data
+
+    def decode(self, payload):
+        service_key, cleaned_data = payload
+        return service_key, cleaned_data
+
+
+class JSONCodec(object):
+    """
+    Encodes ``cleaned_data`` into JSON compatible values, so tasks can be
+    sent with Celery's ``json`` serializer.  JSON types are sent as they
+    are; other supported values are tagged with a single key dictionary:
+
+    ====================== ==============================================
+    value                  encoded as
+    ====================== ==============================================
+    model reference        ``{"$m": ["app_label.Model", pk]}``
+    list of references     ``{"$m": ["app_label.Model", [pk, ...]]}``
+    ``datetime.datetime``  ``{"$dt": "2020-01-01T12:00:00+00:00"}``
+    ``datetime.date``      ``{"$d": "2020-01-01"}``
+    ``datetime.time``      ``{"$t": "12:00:00"}``
+    ``datetime.timedelta`` ``{"$td": [days, seconds, microseconds]}``
+    ``decimal.Decimal``    ``{"$dec": "1.50"}``
+    ``uuid.UUID``          ``{"$u": "hex"}``
+    ``tuple``              ``{"$tu": [...]}``
+    ``set``                ``{"$set": [...]}``
+    ====================== ==============================================
+
+    Lists are packed when it makes them smaller:
+
+    ============================== ==========================================
+    list                           encoded as
+    ============================== ==========================================
+    dates, decimals, UUIDs, ...    one tag for all items: ``{"$d": [...]}``
+    integers with runs             ``{"$ir": [1, [5, 100]]}``, runs of
+                                   consecutive integers as inclusive
+                                   ``[first, last]`` pairs
+    dictionaries with the same     ``{"$rows": [["a", "b"], [a values],
+    keys                           [b values]]}``, one list per key
+    ============================== ==========================================
+
+    Dictionaries with keys starting with ``$`` are wrapped in
+    ``{"$dict": {...}}``.  Other values raise :class:`TypeError`.
+    """
+    serializer = 'json'
+
+    #: tags of the values encoded as a string, by exact type.
+    string_tags = {
+        datetime.datetime: '$dt',
+        datetime.date: '$d',
+        datetime.time: '$t',
+        decimal.Decimal: '$dec',
+        uuid.UUID: '$u',
+    }
+
+    def encode(self, service_key, cleaned_data):
+        return [service_key, self.encode_value(cleaned_data)]
+
+    def decode(self, payload):
+        service_key, cleaned_data = payload
+        return service_key, self.decode_value(cleaned_data)
+
+    def encode_value(self, value):
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+        if isinstance(value, list):
+            return self.encode_list(value)
+        if isinstance(value, dict):
+            encoded = {}
+            escape = False
+            for key, item in value.items():
+                if not isinstance(key, str):
+                    raise TypeError(
+                        'Only string keys can be encoded, got {!r}'.format(key))
+                escape = escape or key.startswith('$')
+                encoded[key] = self.encode_value(item)
+            return {'$dict': encoded} if escape else encoded
+        if isinstance(value, tuple):
+            if (len(value) == 2 and isinstance(value[0], type)
+                    and issubclass(value[0], models.Model)):
+                return {'$m': [value[0]._meta.label_lower,
+                               self.encode_value(value[1])]}
+            return {'$tu': [self.encode_value(item) for item in value]}
+        if isinstance(value, (set, frozenset)):
+            return {'$set': [self.encode_value(item) for item in value]}
+        if isinstance(value, datetime.timedelta):
+            return {'$td': [value.days, value.seconds, value.microseconds]}
+        for value_type, tag in self.string_tags.items():
+            if isinstance(value, value_type):
+                return {tag: self.encode_string(value)}
+        raise TypeError(
+            '{} can not encode {!r}'.format(type(self).__name__, value))
+
+    @staticmethod
+    def encode_string(value):
+        if isinstance(value, uuid.UUID):
+            return value.hex
+        if isinstance(value, decimal.Decimal):
+            return str(value)
+        return value.isoformat()
+
+    def encode_list(self, value):
+        if len(value) < 2:
+            return [self.encode_value(item) for item in value]
+
+        first = type(value[0])
+        if not all(type(item) is first for item in value):
+            return [self.encode_value(item) for item in value]
+
+        tag = self.string_tags.get(first)
+        if tag is not None:
+            return {tag: [self.encode_string(item) for item in value]}
+        if first is int:
+            return self.encode_ints(value)
+        if first is dict:
+            return self.encode_rows(value)
+        return [self.encode_value(item) for item in value]
+
+    @staticmethod
+    def encode_ints(value):
+        runs = []
+        start = 0
+        for index in range(1, len(value) + 1):
+            if index < len(value) and value[index] == value[index - 1] + 1:
+                continue
+            if index - start > 2:
+                runs.append([value[start], value[index - 1]])
+            else:
+                runs.extend(value[start:index])
+            start = index
+        if len(runs) == len(value):
+            return value
+        return {'$ir': runs}
+
+    def encode_rows(self, value):
+        keys = list(value[0])
+        if not all(isinstance(key, str) for key in keys):
+            raise TypeError(
+                'Only string keys can be encoded, got {!r}'.format(keys))
+        if any(item.keys() != value[0].keys() for item in value):
+            return [self.encode_value(item) for item in value]
+        return {'$rows': [keys] + [
+            self.encode_value([item[key] for item in value]) for key in keys
+        ]}
+
+    def decode_value(self, value):
+        if isinstance(value, list):
+            return [self.decode_value(item) for item in value]
+        if not isinstance(value, dict):
+            return value
+        if len(value) == 1:
+            tag, data = next(iter(value.items()))
+            decoder = self.decoders.get(tag)
+            if decoder is not None:
+                return decoder(self, data)
+        return {key: self.decode_value(item) for key, item in value.items()}
+
+    def _decode_model(self, data):
+        label, pk = data
+        return apps.get_model(label), self.decode_value(pk)
+
+    def _decode_dict(self, data):
+        return {key: self.decode_value(item) for key, item in data.items()}
+
+    def _decode_ints(self, data):
+        value = []
+        for item in data:
+            if isinstance(item, list):
+                value.extend(range(item[0], item[1] + 1))
+            else:
+                value.append(item)
+        return value
+
+    def _decode_rows(self, data):
+        keys = data[0]
+        columns = [self.decode_value(column) for column in data[1:]]
+        return [dict(zip(keys, row)) for row in zip(*columns)]
+
+    def _strings(convert):
+        def decode(self, data):
+            if isinstance(data, list):
+                return [convert(item) for item in data]
+            return convert(data)
+        return decode
+
+    decoders = {
+        '$m': _decode_model,
+        '$dict': _decode_dict,
+        '$ir': _decode_ints,
+        '$rows': _decode_rows,
+        '$tu': lambda self, data: tuple(self.decode_value(data)),
+        '$set': lambda self, data: set(self.decode_value(data)),
+        '$dt': _strings(datetime.datetime.fromisoformat),
+        '$d': _strings(datetime.date.fromisoformat),
+        '$t': _strings(datetime.time.fromisoformat),
+        '$td': lambda self, data: datetime.timedelta(*data),
+        '$dec': _strings(decimal.Decimal),
+        '$u': _strings(uuid.UUID),
+    }
+    del _strings
+
+
+_codecs = {
+    'pickle': PickleCodec(),
+    'json': JSONCodec(),
+}
+
+
+def register_codec(name, codec):
+    """
+    Makes ``codec`` available as :attr:`CeleryService.payload_codec`
+    ``name``.  Codecs need an ``encode(service_key, cleaned_data)`` method
+    returning a payload the Celery ``serializer`` attribute can serialize,
+    and the matching ``decode(payload)`` method returning the
+    ``(service_key, cleaned_data)`` tuple.
+    """
+    _codecs[name] = codec
+
+
+def get_codec(name):
+    """
+    Returns the codec registered as ``name``.
+    """
+    try:
+        return _codecs[name]
+    except KeyError:
+        raise ValueError('Unknown payload codec {!r}'.format(name))
@@ -0,0 +1,156 @@
+import atexit
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+#: ``True`` while executors run calls on the calling thread.
+_synchronous = ContextVar('post_process_synchronous', default=False)
+
+
+@contextmanager
+def run_synchronously():
+    """
+    Makes every :class:`PostProcessExecutor` run the calls submitted by
+    the block on the calling thread, as if the Service had none.  Meant
+    for tests::
+
+        with run_synchronously():
+            CreateBookingService.execute(inputs)
+    """
+    token = _synchronous.set(True)
+    try:
+        yield
+    finally:
+        _synchronous.reset(token)
+
+
+class PostProcessExecutor(object):
+    """
+    Runs :meth:`Service.post_process` on a bounded pool of threads instead
+    of the thread executing the Service, set as its
+    ``post_process_executor``::
+
+        notifications = PostProcessExecutor(max_workers=2, max_pending=50)
+
+        class CreateBookingService(Service):
+            post_process_executor = notifications
+
+    Threads are started on the first call.  At most ``max_pending`` calls
+    wait or run at a time; further calls wait up to ``timeout`` seconds
+    for one of them to finish, then run on the calling thread.  Exceptions
+    raised by calls are passed to ``on_error``, and logged by default.
+    Pending calls are finished when the process exits, or by
+    :meth:`shutdown`.
+
+    :param int max_workers: number of threads.
+
+    :param int max_pending: maximum number of calls waiting or running.
+
+    :param float timeout: seconds a call waits for room, or ``None`` to
+        wait as long as needed.
+
+    :param on_error: callable receiving the exceptions raised by calls.
+
+    :param bool sync: run calls on the calling thread, letting their
+        exceptions propagate; see also :func:`run_synchronously`.
+    """
+    def __init__(self, max_workers=4, max_pending=100, timeout=1.0,
+                 on_error=None, sync=False):
+        if max_pending < 1:
+            raise ValueError('max_pending must be a positive integer')
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.on_error = on_error
+        self.sync = sync
+        self._pool = None
+        self._pending = 0
+        self._closed = False
+        self._lock = threading.Lock()
+        self._idle = threading.Condition()
+
+    def submit(self, func):
+        """
+        Runs ``func`` on the pool, or on the calling thread when
+        synchronous, shut down or out of room.
+        """
+        if self.sync or _synchronous.get():
+            func()
+            return
+
+        with self._idle:
+            queued = not self._closed and self._idle.wait_for(
+                lambda: self._pending < self.max_pending, self.timeout)
+            if queued:
+                self._pending += 1
+
+        if not queued:
+            self._call(func)
+            return
+        try:
+            self._get_pool().submit(self._work, func)
+        except RuntimeError:
+            self._done()
+            self._call(func)
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    self.max_workers, thread_name_prefix='post_process')
+                atexit.register(self.shutdown)
+            return self._pool
+
+    def _work(self, func):
+        try:
+            self._call(func)
+        finally:
+            close_old_connections()
+            self._done()
+
+    def _call(self, func):
+        try:
+            func()
+        except Exception as e:
+            if self.on_error is not None:
+                self.on_error(e)
+            else:
+                logger.exception('post_process failed')
+
+    def _done(self):
+        with self._idle:
+            self._pending -= 1
+            self._idle.notify_all()
+
+    @property
+    def pending(self):
+        """
+        Number of calls waiting or running.
+        """
+        return self._pending
+
+    def drain(self, timeout=None):
+        """
+        Waits until all submitted calls finished, at most ``timeout``
+        seconds.  Returns ``False`` if some are still pending.
+        """
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    def shutdown(self, wait=True):
+        """
+        Stops the threads, after finishing pending calls if ``wait``.
+        Calls submitted afterwards run on the calling thread.
+        """
+        with self._idle:
+            self._closed = True
+        with self._lock:
+            pool = self._pool
+        if pool is not None:
+            pool.shutdown(wait=wait)
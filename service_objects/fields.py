@@ -1,8 +1,15 @@
+from itertools import chain
+
 from django import forms
 from django.apps import apps
-from django.core.exceptions import ValidationError
+from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
+from django.core.validators import EMPTY_VALUES
+from django.db import models
+from django.db.models.query import ModelIterable, QuerySet
 from django.utils.translation import ngettext_lazy, gettext_lazy as _
 
+from .validation import _is_overridden, compile_validator
+
 
 class MultipleFormField(forms.Field):
     """
@@ -27,6 +34,29 @@ class MultipleFormField(forms.Field):
                 { 'name': 'Adam Davis' },
             ]
         })
+
+    Any iterable is accepted, e.g. a CSV reader.  Iterators are validated
+    as they are read, and reading stops as soon as there are more than
+    ``max_count`` items.
+
+    With ``bulk=True``, items are validated against the fields of
+    ``form_class`` compiled once, without creating a form per item, and
+    ``cleaned_data`` holds the items' cleaned dictionaries instead of
+    forms.  Forms with ``clean_<name>`` methods, a custom ``clean`` or
+    other customized validation are still validated one form per item,
+    but return dictionaries too.
+
+    :param form_class: :class:`Form` validating each item
+    :param min_count: minimum number of items
+    :param max_count: maximum number of items
+    :param bulk: whether to validate items without forms, returning
+            dictionaries
+    :param collect_errors: whether to report the errors of all invalid
+            items, with their indices, instead of only the first one
+    :param lazy: whether ``cleaned_data`` holds an iterator validating
+            items as :meth:`Service.process` reads them, instead of a
+            list.  Invalid items then raise :class:`ValidationError`
+            while iterating.
     """
     error_min = ngettext_lazy("There needs to be at least %(num)d item.",
                               "There needs to be at least %(num)d items.",
@@ -36,14 +66,23 @@ class MultipleFormField(forms.Field):
                               'num')
     error_required = _("Input is required. "
                        "Expected not empty list but got %(values)r.")
+    error_item_type = _("Expected a dictionary but got %(value)r.")
+    error_non_iterable = _("Object is not iterable.")
 
     def __init__(self, form_class, min_count=1, max_count=None, *args,
-                 **kwargs):
+                 bulk=False, collect_errors=False, lazy=False, **kwargs):
         super(MultipleFormField, self).__init__(*args, **kwargs)
 
         self.form_class = form_class
         self.min_count = min_count
         self.max_count = max_count
+        self.bulk = bulk
+        self.collect_errors = collect_errors
+        self.lazy = lazy
+        self._clean_item = None
+        if bulk:
+            # Compiled once here, as Services use copies of their fields.
+            self.get_item_cleaner()
 
     def clean(self, values):
         if not values and values is not False:
@@ -54,21 +93,116 @@ class MultipleFormField(forms.Field):
             else:
                 return []
 
-        if len(values) < self.min_count:
-            raise ValidationError(self.error_min % {'num': self.min_count})
-
-        if self.max_count and len(values) > self.max_count:
-            raise ValidationError(self.error_max % {'num': self.max_count})
+        sized = hasattr(values, '__len__')
+        if sized:
+            if len(values) < self.min_count:
+                raise ValidationError(
+                    self.error_min % {'num': self.min_count})
 
-        item_forms = []
+            if self.max_count and len(values) > self.max_count:
+                raise ValidationError(
+                    self.error_max % {'num': self.max_count})
+        else:
+            try:
+                values = iter(values)
+            except TypeError:
+                raise ValidationError(self.error_non_iterable)
+
+        cleaned_items = self._clean_items(values, check_count=not sized)
+        if self.lazy:
+            return self._lazy_items(cleaned_items)
+
+        items = []
+        errors = []
+        for index, cleaned, item_errors in cleaned_items:
+            if item_errors:
+                error = self.item_error(index, item_errors)
+                if not self.collect_errors:
+                    raise error
+                errors.append(error)
+            else:
+                items.append(cleaned)
+
+        if errors:
+            raise ValidationError(errors)
+        return items
+
+    def _clean_items(self, values, check_count):
+        """
+        Yields ``(index, cleaned value, errors)`` for every item of
+        ``values``.  With ``check_count``, for values that couldn't be
+        counted upfront, the number of items is checked as they are read:
+        reading stops as soon as there are more than ``max_count``.
+        """
+        clean_item = self.get_item_cleaner()
+        count = 0
         for index, item in enumerate(values):
-            item_form = self.form_class(item)
-            if not item_form.is_valid():
+            count = index + 1
+            if check_count and self.max_count and count > self.max_count:
+                raise ValidationError(self.error_max % {'num': self.max_count})
+            cleaned, errors = clean_item(item)
+            yield index, cleaned, errors
+
+        if check_count:
+            if not count and self.required:
+                raise ValidationError(self.error_required % {'values': []})
+            if count and count < self.min_count:
                 raise ValidationError(
-                    '[{}]: {}'.format(index, repr(item_form.errors)))
-            item_forms.append(item_form)
-
-        return item_forms
+                    self.error_min % {'num': self.min_count})
+
+    def _lazy_items(self, cleaned_items):
+        items = self._raise_item_errors(cleaned_items)
+        # Validate the first item now, so empty inputs fail validation.
+        for first in items:
+            return chain([first], items)
+        return iter(())
+
+    def _raise_item_errors(self, cleaned_items):
+        for index, cleaned, errors in cleaned_items:
+            if errors:
+                raise self.item_error(index, errors)
+            yield cleaned
+
+    def item_error(self, index, errors):
+        return ValidationError('[{}]: {}'.format(index, repr(errors)))
+
+    def get_item_cleaner(self):
+        """
+        Returns the function validating a single item, returning its
+        ``(cleaned value, errors)``.
+        """
+        if self._clean_item is None:
+            self._clean_item = self._clean_form
+            if self.bulk:
+                self._clean_item = self._clean_form_data
+                validator = compile_validator(self.form_class)
+                if validator is not None and not validator.has_hooks and \
+                        not _is_overridden(
+                            self.form_class, forms.BaseForm, 'clean'):
+                    self._clean_item = self._validator_cleaner(validator)
+        return self._clean_item
+
+    def _clean_form(self, item):
+        item_form = self.form_class(item)
+        if item_form.is_valid():
+            return item_form, None
+        return None, item_form.errors
+
+    def _clean_form_data(self, item):
+        item_form, errors = self._clean_form(item)
+        if errors:
+            return None, errors
+        return item_form.cleaned_data, None
+
+    def _validator_cleaner(self, validator):
+        error_item_type = self.error_item_type
+
+        def clean_item(item):
+            if not hasattr(item, 'get'):
+                return None, {NON_FIELD_ERRORS: [
+                    error_item_type % {'value': item}]}
+            return validator.clean_data(item)
+        return clean_item
 
 
 class ModelField(forms.Field):
@@ -103,6 +237,14 @@ class ModelField(forms.Field):
             class:`Model` name
     :param allow_unsaved: Whether the object is required to be saved to
             the database
+    :param accept_pk: Whether primary keys are accepted in place of
+            objects.  Services fetch the objects of all their fields
+            with one query per model.
+    :param select_related: ``select_related`` lookups applied when
+            fetching objects from primary keys
+    :param queryset: QuerySet objects given by primary key are fetched
+            from, e.g. to restrict them to active ones.  Defaults to all
+            objects of ``model_class``.
     """
     error_model_class = _("%(cls_name)s(%(model_class)r) is invalid.  First "
                           "parameter of ModelField must be either a model or a "
@@ -110,8 +252,12 @@ class ModelField(forms.Field):
     error_type = _("Objects needs to be of type %(model_class)r")
     error_unsaved = _("Unsaved objects are not allowed.")
     error_required = _("Input is required. Expected model but got %(value)r.")
+    error_missing = _("No %(model_name)s matches the primary key(s) "
+                      "%(pks)s.")
 
-    def __init__(self, model_class, allow_unsaved=False, *args, **kwargs):
+    def __init__(self, model_class, allow_unsaved=False, *args,
+                 accept_pk=False, select_related=None, queryset=None,
+                 **kwargs):
         super(ModelField, self).__init__(*args, **kwargs)
 
         try:
@@ -123,15 +269,63 @@ class ModelField(forms.Field):
             }
 
         self.model_class = model_class
-        if isinstance(model_class, str):
-            label = model_class.split('.')
-            app_label = ".".join(label[:-1])
-            model_name = label[-1]
-            self.model_class = apps.get_model(app_label, model_name)
 
         self.allow_unsaved = allow_unsaved
+        self.accept_pk = accept_pk
+        self.select_related = tuple(select_related or ())
+        self.queryset = queryset
+
+    @property
+    def model_class(self):
+        """
+        The :class:`Model` of the field.  Dotted model names are only
+        looked up in the app registry the first time the model is needed.
+        """
+        return self._model.get()
+
+    @model_class.setter
+    def model_class(self, model_class):
+        # Shared with the copies Services make of their fields, so the
+        # model is only looked up once per declared field.
+        self._model = ModelReference(model_class)
+
+    def get_queryset(self):
+        """
+        Returns the QuerySet objects given by primary key are fetched
+        from, without the ``select_related`` lookups.
+        """
+        if self.queryset is not None:
+            return self.queryset.all()
+        return self.model_class._default_manager.all()
+
+    def get_pks(self, value):
+        """
+        Returns the list of primary keys in ``value`` to fetch, or
+        ``None`` if there are none.
+        """
+        if not self.accept_pk or value in EMPTY_VALUES or isinstance(
+                value, (models.Model, ResolvedModels)):
+            return None
+        return [value]
+
+    def resolve(self, value, objects):
+        """
+        Returns ``value`` with its primary keys replaced by the matching
+        objects of ``objects``, a ``{pk: object}`` dictionary.
+        """
+        return objects[self.to_pk(value)]
+
+    def to_pk(self, pk):
+        return self.model_class._meta.pk.to_python(pk)
+
+    def missing_error(self, pks):
+        return ValidationError(self.error_missing % {
+            'model_name': self.model_class._meta.verbose_name,
+            'pks': ', '.join(str(pk) for pk in pks),
+        })
 
     def clean(self, value):
+        value = self.resolve_pks(value)
         if not value and value is not False:
             if self.required:
                 raise ValidationError(self.error_required % {
@@ -142,6 +336,19 @@ class ModelField(forms.Field):
             self.check_unsaved(value)
         return value
 
+    def resolve_pks(self, value):
+        """
+        Replaces primary keys in ``value`` by their objects, unless a
+        Service already fetched them.
+        """
+        if not isinstance(value, ResolvedModels):
+            if self.get_pks(value) is None:
+                return value
+            value = resolve_pks({None: self}, {None: value})[None]
+        if value.error is not None:
+            raise value.error
+        return value.value
+
     def check_type(self, item):
         if not isinstance(item, self.model_class):
             raise ValidationError(self.error_type % {
@@ -180,6 +387,9 @@ class MultipleModelField(ModelField):
         for user in users:
             user.save()
 
+    QuerySets (and managers) are accepted as they are and stay unevaluated
+    in ``cleaned_data``; other iterators are read once into a list.
+
     :param model_class: Django :class:`Model` or dotted string of :
             class:`Model` name
     :param allow_unsaved: Whether the object is required to be saved to
@@ -190,7 +400,29 @@ class MultipleModelField(ModelField):
     error_required = _("Input is required expected list "
                        "of models but got %(values)r.")
 
+    def get_pks(self, values):
+        if not self.accept_pk or not isinstance(values, (list, tuple)):
+            return None
+        pks = [
+            value for value in values if not isinstance(value, models.Model)
+        ]
+        return pks or None
+
+    def resolve(self, values, objects):
+        return [
+            value if isinstance(value, models.Model)
+            else objects[self.to_pk(value)]
+            for value in values
+        ]
+
     def clean(self, values):
+        values = self.resolve_pks(values)
+        if isinstance(values, models.Manager):
+            values = values.all()
+        if (isinstance(values, QuerySet)
+                and values._iterable_class is ModelIterable):
+            return self.clean_queryset(values)
+
         if not values and values is not False:
             if self.required:
                 raise ValidationError(self.error_required % {
@@ -200,15 +432,131 @@ class MultipleModelField(ModelField):
                 return values
 
         try:
-            _ = iter(values)
+            items = iter(values)
         except TypeError:
             raise ValidationError(self.error_non_iterable)
 
-        for value in values:
+        # Iterators can only be read once; keep their items.
+        collected = [] if items is values else None
+        for value in items:
             self.check_type(value)
             self.check_unsaved(value)
+            if collected is not None:
+                collected.append(value)
+
+        if collected is not None:
+            if not collected and self.required:
+                raise ValidationError(self.error_required % {
+                    'values': collected
+                })
+            return collected
         return values
 
+    def clean_queryset(self, queryset):
+        """
+        Validates ``queryset`` without evaluating it: the type is checked
+        on its model, and its rows are saved objects by definition.  A
+        required field runs an ``exists()`` query.  Querysets returning
+        something else than model instances, like ``values()``, are
+        validated item by item.
+        """
+        if not issubclass(queryset.model, self.model_class):
+            raise ValidationError(self.error_type % {
+                'model_class': self.model_class
+                }
+            )
+        if self.required and not queryset.exists():
+            raise ValidationError(self.error_required % {
+                'values': queryset.none()
+            })
+        return queryset
+
+
+class ModelReference(object):
+    """
+    :class:`Model`, or dotted model name resolved on first use.
+    """
+    __slots__ = ('label', 'model')
+
+    def __init__(self, model):
+        self.label = None
+        self.model = None
+        if isinstance(model, str):
+            self.label = model
+        else:
+            self.model = model
+
+    def get(self):
+        if self.model is None:
+            label = self.label.split('.')
+            app_label = ".".join(label[:-1])
+            model_name = label[-1]
+            self.model = apps.get_model(app_label, model_name)
+        return self.model
+
+
+class ResolvedModels(object):
+    """
+    Input of a :class:`ModelField` whose primary keys were fetched by
+    :func:`resolve_pks`: holds either the resolved ``value`` or the
+    ``error`` to raise.
+    """
+    __slots__ = ('value', 'error')
+
+    def __init__(self, value=None, error=None):
+        self.value = value
+        self.error = error
+
+
+def resolve_pks(fields, data):
+    """
+    Fetches the objects of the primary keys given to the ``accept_pk``
+    :class:`ModelField` and :class:`MultipleModelField` of ``fields``
+    (a dictionary of data keys to fields) in ``data``, with one query per
+    model and ``queryset``.  Returns a copy of ``data`` where those values
+    are replaced by :class:`ResolvedModels`, or ``data`` itself if there
+    is nothing to fetch.
+    """
+    requests = []
+    errors = {}
+    groups = {}
+    for key, field in fields.items():
+        value = data.get(key)
+        pks = field.get_pks(value)
+        if pks is None:
+            continue
+        try:
+            pks = [field.to_pk(pk) for pk in pks]
+        except ValidationError as e:
+            errors[key] = e
+            continue
+        group = groups.setdefault(
+            (field.model_class, id(field.queryset)),
+            {'field': field, 'pks': set(), 'select_related': set()})
+        group['pks'].update(pks)
+        group['select_related'].update(field.select_related)
+        requests.append((key, field, value, pks, group))
+
+    if not requests and not errors:
+        return data
+
+    for group in groups.values():
+        queryset = group['field'].get_queryset()
+        if group['select_related']:
+            queryset = queryset.select_related(*group['select_related'])
+        group['objects'] = queryset.in_bulk(list(group['pks']))
+
+    data = data.copy()
+    for key, error in errors.items():
+        data[key] = ResolvedModels(error=error)
+    for key, field, value, pks, group in requests:
+        missing = [pk for pk in pks if pk not in group['objects']]
+        if missing:
+            data[key] = ResolvedModels(error=field.missing_error(missing))
+        else:
+            data[key] = ResolvedModels(field.resolve(value, group['objects']))
+    return data
+
 
 class DictField(forms.Field):
     """
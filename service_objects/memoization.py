@@ -0,0 +1,261 @@
+import hashlib
+import threading
+from collections import OrderedDict, namedtuple
+from time import monotonic
+
+from django.core.exceptions import EmptyResultSet
+from django.db import models, transaction
+from django.db.models.query import QuerySet
+
+
+MemoizeStats = namedtuple('MemoizeStats', ['hits', 'misses', 'size'])
+MemoizeStats.__doc__ = """
+Statistics of a :class:`Memoize` cache, counted by the current process.
+
+:ivar int hits: executions answered from the cache
+
+:ivar int misses: executions which ran :meth:`Service.process`
+
+:ivar size: number of cached results, or ``None`` if the backend can't
+    tell
+"""
+
+
+def freeze(value):
+    """
+    Returns a hashable equivalent of a ``cleaned_data`` value: model
+    instances become ``(label, pk)``, querysets their SQL, without being
+    evaluated, and lists, sets and dictionaries become tuples.  Raises
+    :class:`TypeError` for unhashable values it doesn't know and for
+    unsaved model instances, which have no identity.
+    """
+    if isinstance(value, models.Model):
+        if value.pk is None:
+            raise TypeError('Unsaved {!r} has no key'.format(value))
+        return value._meta.label_lower, value.pk
+    if isinstance(value, QuerySet):
+        try:
+            sql = str(value.query)
+        except EmptyResultSet:
+            sql = None
+        return 'queryset', value.model._meta.label_lower, sql
+    if isinstance(value, dict):
+        return ('dict',) + tuple(sorted(
+            (key, freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return ('set',) + tuple(sorted(freeze(item) for item in value))
+    hash(value)
+    return value
+
+
+def make_key(cleaned_data):
+    """
+    Default :class:`Memoize` key function, freezing the whole
+    ``cleaned_data``.
+    """
+    return freeze(cleaned_data)
+
+
+class LRUBackend(object):
+    """
+    In-process cache keeping the ``max_entries`` most recently used
+    results.
+    """
+    def __init__(self, max_entries=1000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Returns ``(True, result)`` if ``key`` is cached, ``(False, None)``
+        otherwise.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            result, expires = entry
+            if expires is not None and expires <= monotonic():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, result
+
+    def set(self, key, result, ttl):
+        expires = None if ttl is None else monotonic() + ttl
+        with self._lock:
+            self._entries[key] = (result, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self, service_key):
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == service_key]:
+                del self._entries[key]
+
+    def size(self):
+        return len(self._entries)
+
+
+class DjangoCacheBackend(object):
+    """
+    Stores results in the Django cache ``alias``, so they are shared by
+    processes.  Results must be picklable; ``max_entries`` is left to the
+    cache's own configuration.
+    """
+    _missing = object()
+
+    def __init__(self, alias='default', prefix='service_objects.memoize'):
+        self.alias = alias
+        self.prefix = prefix
+
+    @property
+    def cache(self):
+        from django.core.cache import caches
+        return caches[self.alias]
+
+    def _generation_key(self, service_key):
+        return '{}:{}:generation'.format(self.prefix, service_key)
+
+    def _cache_key(self, key):
+        service_key, data = key
+        generation = self.cache.get(self._generation_key(service_key), 0)
+        digest = hashlib.sha256(repr(data).encode('utf-8')).hexdigest()
+        return '{}:{}:{}:{}'.format(
+            self.prefix, service_key, generation, digest)
+
+    def get(self, key):
+        result = self.cache.get(self._cache_key(key), self._missing)
+        if result is self._missing:
+            return False, None
+        return True, result
+
+    def set(self, key, result, ttl):
+        self.cache.set(self._cache_key(key), result, ttl)
+
+    def delete(self, key):
+        self.cache.delete(self._cache_key(key))
+
+    def clear(self, service_key):
+        generation_key = self._generation_key(service_key)
+        self.cache.set(
+            generation_key, self.cache.get(generation_key, 0) + 1, None)
+
+    def size(self):
+        return None
+
+
+class Memoize(object):
+    """
+    Result cache of a Service, set as its ``memoize`` attribute.  The
+    result of :meth:`Service.process` is cached under a key derived from
+    ``cleaned_data`` once its transaction (and any outer one) commits,
+    and later executions with the same key return it without running
+    :meth:`Service.process` or :meth:`Service.post_process`.  Only use
+    it for services without side effects::
+
+        class QuotePrice(Service):
+            memoize = Memoize(ttl=60, max_entries=10000)
+
+            product = ModelField(Product)
+            quantity = forms.IntegerField()
+
+    :param ttl: seconds results are kept for, or ``None`` to keep them
+        until they are evicted or invalidated.
+
+    :param int max_entries: maximum number of results kept by the
+        ``'lru'`` backend.
+
+    :param key: function returning the key of a ``cleaned_data``; it
+        must be hashable and its ``repr`` stable across processes when
+        using the Django cache.  Returning ``None`` skips the cache.  By
+        default the whole ``cleaned_data`` is used, with model instances
+        reduced to ``(label, pk)``.
+
+    :param backend: ``'lru'`` (default) for an in-process cache,
+        ``'django'`` for the ``'default'`` Django cache, or a backend
+        object such as :class:`DjangoCacheBackend`.
+    """
+    def __init__(self, ttl=None, max_entries=1000, key=make_key,
+                 backend='lru'):
+        if backend == 'lru':
+            backend = LRUBackend(max_entries)
+        elif backend == 'django':
+            backend = DjangoCacheBackend()
+        self.ttl = ttl
+        self.key = key
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get_key(self, service_class, cleaned_data):
+        """
+        Returns the cache key of ``cleaned_data`` for ``service_class``,
+        or ``None`` if it can't be cached.
+        """
+        try:
+            key = self.key(cleaned_data)
+        except TypeError:
+            return None
+        if key is None:
+            return None
+        return service_class.__module__ + ':' + service_class.__qualname__, key
+
+    def execute(self, instance, timer=None, savepoint=None):
+        """
+        Returns the cached result of the validated ``instance``, running
+        it on a miss.
+        """
+        key = self.get_key(type(instance), instance.cleaned_data)
+        if key is not None:
+            hit, result = self.backend.get(key)
+            with self._lock:
+                if hit:
+                    self.hits += 1
+                else:
+                    self.misses += 1
+            if hit:
+                return result
+
+        result = instance._run_process(timer, savepoint)
+
+        if key is not None:
+            # Nested in an outer transaction, the result is only valid
+            # once that one commits too.
+            transaction.on_commit(
+                lambda: self.backend.set(key, result, self.ttl),
+                using=instance.using)
+        return result
+
+    def invalidate(self, service_class, cleaned_data=None):
+        """
+        Forgets the result cached for ``cleaned_data``, or all the results
+        of ``service_class`` if it is ``None``.
+        """
+        if cleaned_data is None:
+            self.backend.clear(
+                service_class.__module__ + ':' + service_class.__qualname__)
+            return
+        key = self.get_key(service_class, cleaned_data)
+        if key is not None:
+            self.backend.delete(key)
+
+    def stats(self):
+        """
+        Returns the :class:`MemoizeStats` of the cache.
+        """
+        return MemoizeStats(self.hits, self.misses, self.backend.size())
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
@@ -0,0 +1,60 @@
+import random
+
+from django.db import DatabaseError
+
+#: SQLSTATE codes of serialization failures and deadlocks.
+POSTGRESQL_CODES = frozenset(['40001', '40P01'])
+
+#: MySQL error codes of deadlocks (1213) and lock wait timeouts (1205).
+MYSQL_CODES = frozenset([1205, 1213])
+
+#: Oracle errors of deadlocks and serialization failures.
+ORACLE_CODES = ('ORA-00060', 'ORA-08177')
+
+
+def _postgresql(exception):
+    cause = exception.__cause__
+    code = getattr(cause, 'pgcode', None) or getattr(cause, 'sqlstate', None)
+    return code in POSTGRESQL_CODES
+
+
+def _mysql(exception):
+    return bool(exception.args) and exception.args[0] in MYSQL_CODES
+
+
+def _sqlite(exception):
+    return 'database is locked' in str(exception)
+
+
+def _oracle(exception):
+    message = str(exception)
+    return any(code in message for code in ORACLE_CODES)
+
+
+_classifiers = {
+    'postgresql': _postgresql,
+    'mysql': _mysql,
+    'sqlite': _sqlite,
+    'oracle': _oracle,
+}
+
+
+def is_retryable(exception, connection):
+    """
+    Returns ``True`` if ``exception`` is a deadlock or serialization
+    failure of ``connection``'s database, after which the whole
+    transaction can be run again.
+    """
+    if not isinstance(exception, DatabaseError):
+        return False
+    classifier = _classifiers.get(connection.vendor)
+    return classifier is not None and classifier(exception)
+
+
+def backoff(attempt, base, cap):
+    """
+    Returns the delay before retry ``attempt`` (starting at 1): a random
+    duration up to ``base * 2 ** (attempt - 1)``, capped at ``cap``
+    seconds.
+    """
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
@@ -0,0 +1,79 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+#: database alias reads are routed to while a read-only service runs.
+_read_database = ContextVar('service_read_database', default=None)
+
+#: ``None`` when writes aren't tracked, otherwise whether a write happened
+#: during the current request.
+_primary_pinned = ContextVar('service_primary_pinned', default=None)
+
+
+@contextmanager
+def read_from(using):
+    """
+    Routes the reads of the block to ``using`` through
+    :class:`ServiceRouter`; does nothing if ``using`` is ``None``.
+    """
+    if using is None:
+        yield
+        return
+    token = _read_database.set(using)
+    try:
+        yield
+    finally:
+        _read_database.reset(token)
+
+
+def primary_pinned():
+    """
+    Returns ``True`` if the current request wrote to the database, with
+    :class:`StickyPrimaryMiddleware` installed.
+    """
+    return bool(_primary_pinned.get())
+
+
+def pin_primary():
+    """
+    Sends the reads of read-only services to the primary database for the
+    rest of the current request.  Called by :class:`ServiceRouter` on
+    writes.
+    """
+    if _primary_pinned.get() is not None:
+        _primary_pinned.set(True)
+
+
+class ServiceRouter(object):
+    """
+    Database router sending the reads of read-only services to their
+    replica.  Add it first to ``DATABASE_ROUTERS``; it leaves everything
+    else to the following routers::
+
+        DATABASE_ROUTERS = [
+            'service_objects.routers.ServiceRouter',
+            'myproject.routers.ReplicaRouter',
+        ]
+    """
+    def db_for_read(self, model, **hints):
+        return _read_database.get()
+
+    def db_for_write(self, model, **hints):
+        pin_primary()
+        return None
+
+
+class StickyPrimaryMiddleware(object):
+    """
+    Keeps read-only services of a request on the primary database once
+    the request wrote to it, so they see their own writes despite
+    replication lag.  Writes are detected by :class:`ServiceRouter`.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = _primary_pinned.set(False)
+        try:
+            return self.get_response(request)
+        finally:
+            _primary_pinned.reset(token)
@@ -1,67 +1,286 @@
 import abc
-from contextlib import contextmanager
+import copy
+import inspect
+import random
+from collections import namedtuple
+from collections.abc import MutableMapping
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from functools import partial
+from itertools import islice
+from time import perf_counter, sleep
 
 from django import forms
-from django.db import transaction, DEFAULT_DB_ALIAS
+from django.core.exceptions import (ImproperlyConfigured, NON_FIELD_ERRORS,
+                                    ValidationError)
+from django.db import DatabaseError, models, transaction, DEFAULT_DB_ALIAS
+from django.db.models.query import QuerySet
 from django.forms.forms import DeclarativeFieldsMetaclass
 from django.forms.models import ModelFormMetaclass
+from django.forms.utils import ErrorDict, ErrorList
 import six
 
 from .errors import InvalidInputsError
+from .fields import ModelField, MultipleFormField, resolve_pks
+from .retry import backoff, is_retryable
+from .routers import primary_pinned, read_from
+from .signals import service_phase_timed, service_retried
+from .validation import compile_validator
 
 
-class ServiceMetaclass(abc.ABCMeta, DeclarativeFieldsMetaclass):
-    pass
+BatchResult = namedtuple('BatchResult', ['index', 'result', 'error'])
+BatchResult.__doc__ = """
+Outcome of a single item executed through :meth:`Service.execute_many`.
+
+:ivar int index: position of the item in the ``inputs`` iterable
+
+:ivar result: return value of :meth:`Service.process` for the item, or
+    ``None`` if the item was invalid
 
+:ivar error: :class:`InvalidInputsError` raised while validating the
+    item, or ``None`` if it was processed
+"""
 
-@six.add_metaclass(ServiceMetaclass)
-class Service(forms.Form):
+
+class SharedFields(dict):
     """
-    Based on Django's :class:`Form`, designed to encapsulate
-    Business Rules functionality.  Input values are validated against
-    the Service's defined fields before calling main functionality::
+    ``base_fields`` of a Service with ``share_fields = True``.  Deep-copying
+    it (as :class:`Form` does for every instance) returns a
+    :class:`FieldsView` instead of copying every field.
+    """
+    def __deepcopy__(self, memo):
+        return FieldsView(self)
 
-        class UpdateUserEmail(Service):
-            user = ModelField(User)
-            new_email = forms.EmailField()
 
-            def process(self):
-                old_email = user.email
-                user.email = self.cleaned_data['new_email']
-                user.save()
+class FieldsView(MutableMapping):
+    """
+    Copy-on-write ``fields`` mapping of a Service instance.  Field objects
+    are shared with the class until the instance changes them: assigning
+    or deleting entries copies the mapping, and :meth:`mutable` copies a
+    single field so its attributes can be safely modified.
+    """
+    def __init__(self, shared):
+        self._shared = shared
+        self._fields = None
 
-                send_email(
-                    'Email Update',
-                    'Your email was changed',
-                    'system',
-                    [old_email]
-                )
+    def __getitem__(self, name):
+        if self._fields is None:
+            return self._shared[name]
+        return self._fields[name]
 
+    def __setitem__(self, name, field):
+        self._own()[name] = field
 
-        user = User.objects.get(id=20)
+    def __delitem__(self, name):
+        del self._own()[name]
 
-        UpdateUserEmail.execute({
-            'user': user,
-            'new_email': 'John.Smith@example.com'
-        })
+    def __iter__(self):
+        return iter(self._shared if self._fields is None else self._fields)
 
+    def __len__(self):
+        return len(self._shared if self._fields is None else self._fields)
 
-    :cvar boolean db_transaction: controls if :py:meth:`execute`
-        is performed inside a Django database transaction.  Default
-        is True.
+    def __repr__(self):
+        return '{}({!r})'.format(type(self).__name__, dict(self))
+
+    def __deepcopy__(self, memo):
+        return {
+            name: copy.deepcopy(field, memo)
+            for name, field in self.items()
+        }
+
+    def _own(self):
+        if self._fields is None:
+            self._fields = dict(self._shared)
+        return self._fields
+
+    @property
+    def is_shared(self):
+        """
+        ``True`` while the instance still uses the class' field
+        definitions unchanged.
+        """
+        return self._fields is None
+
+    def mutable(self, name):
+        """
+        Returns a private copy of field ``name`` which can be modified
+        without affecting other instances::
+
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.fields.mutable('email').required = False
+        """
+        field = self[name]
+        if field is self._shared.get(name):
+            field = copy.deepcopy(field)
+            self[name] = field
+        return field
 
-    :cvar string using: In a multiple database setup, controls which
-        database connection is used from the transaction.  Defaults
-        to DEFAULT_DB_ALIAS which works in a single database setup.
 
+class PhaseTimer(object):
     """
+    Times the phases of a single Service execution and reports them
+    through :data:`service_phase_timed`.
+    """
+    __slots__ = ('service_class', 'using', 'committing', 'excluded')
+
+    def __init__(self, service_class):
+        self.service_class = service_class
+        self.using = service_class.using
+        self.committing = None
+        self.excluded = 0.0
+
+    def send(self, phase, duration, outcome, exception=None):
+        service_phase_timed.send(
+            sender=self.service_class,
+            phase=phase,
+            duration=duration,
+            using=self.using,
+            outcome=outcome,
+            exception=exception,
+        )
+
+    @contextmanager
+    def phase(self, name):
+        start = perf_counter()
+        try:
+            yield
+        except InvalidInputsError as e:
+            self.send(name, perf_counter() - start, 'invalid', e)
+            raise
+        except Exception as e:
+            self.send(name, perf_counter() - start, 'error', e)
+            raise
+        self.send(name, perf_counter() - start, 'success')
+
+    def timed(self, name, func):
+        """
+        Wraps ``func`` so its calls are reported as phase ``name``.
+        """
+        def wrapper():
+            start = perf_counter()
+            try:
+                with self.phase(name):
+                    func()
+            finally:
+                self.excluded += perf_counter() - start
+        return wrapper
+
+    def mark(self):
+        """
+        Marks the end of :meth:`process`; the commit phase starts.
+        """
+        self.committing = perf_counter()
+        self.excluded = 0.0
+
+    @contextmanager
+    def commit(self):
+        """
+        Reports the time between :meth:`mark` and leaving the transaction,
+        minus ``post_process`` calls run by its ``on_commit`` hooks.
+        """
+        try:
+            yield
+        except Exception as e:
+            if self.committing is not None:
+                self.send('commit', self.elapsed(), 'error', e)
+            raise
+        if self.committing is not None:
+            self.send('commit', self.elapsed(), 'success')
+
+    def elapsed(self):
+        return perf_counter() - self.committing - self.excluded
+
+
+#: database aliases of the transactions opened by the services currently
+#: running, innermost last.
+_service_transactions = ContextVar('service_transactions', default=())
+
+
+@contextmanager
+def service_transaction(using, savepoint=True):
+    """
+    Opens the transaction of a service on ``using``.  Without
+    ``savepoint``, a service running inside another service's transaction
+    on the same database joins it instead of creating a savepoint.
+    """
+    outer = _service_transactions.get()
+    if savepoint or using not in outer:
+        atomic = transaction.atomic(using=using)
+    else:
+        atomic = transaction.atomic(using=using, savepoint=False)
+    token = _service_transactions.set(outer + (using,))
+    try:
+        with atomic:
+            yield
+    finally:
+        _service_transactions.reset(token)
+
+
+def pk_fields(fields):
+    """
+    Returns the names of the ``accept_pk`` model fields of ``fields``.
+    """
+    return tuple(
+        name for name, field in fields.items()
+        if isinstance(field, ModelField) and field.accept_pk
+    )
+
+
+def prewarm_fields(fields):
+    """
+    Resolves the models of the :class:`ModelField` of ``fields``,
+    including those of :class:`MultipleFormField` item forms.
+    """
+    for field in fields.values():
+        if isinstance(field, ModelField):
+            field.model_class
+        elif isinstance(field, MultipleFormField):
+            prewarm_fields(field.form_class.base_fields)
+
+
+class ServiceMetaclass(abc.ABCMeta, DeclarativeFieldsMetaclass):
+    def __new__(mcs, name, bases, attrs):
+        new_class = super(ServiceMetaclass, mcs).__new__(
+            mcs, name, bases, attrs)
+
+        if new_class.share_fields:
+            new_class.base_fields = SharedFields(new_class.base_fields)
+
+        new_class._pk_fields = pk_fields(new_class.base_fields)
+
+        new_class._validator = None
+        if new_class.fast_validation:
+            new_class._validator = compile_validator(new_class)
+
+        return new_class
+
+
+@six.add_metaclass(abc.ABCMeta)
+class BaseService(object):
+    """
+    Execution logic shared by :class:`Service` and :class:`LightService`:
+    runs :meth:`process` (and :meth:`post_process`) inside the configured
+    database transaction once inputs have been validated by
+    :meth:`service_clean`.
+    """
+    __slots__ = ()
 
     db_transaction = True
     run_post_process = True
     using = DEFAULT_DB_ALIAS
+    savepoint = True
+    read_only = False
+    replicas = None
+    memoize = None
+    retry_attempts = 0
+    retry_backoff = 0.05
+    retry_max_backoff = 1.0
+    post_process_executor = None
 
     @classmethod
-    def execute(cls, inputs, files=None, **kwargs):
+    def execute(cls, inputs, files=None, savepoint=None, **kwargs):
         """
         Function to be called from the outside to kick off the Service
         functionality.
@@ -72,21 +291,219 @@ class Service(forms.Form):
         :param dictionary files: usually request's FILES dictionary or
             None.
 
+        :param bool savepoint: overrides :attr:`savepoint` for this call.
+
         :param dictionary **kwargs: any additional parameters Service may
             need, can be an empty dictionary
         """
+        if service_phase_timed.receivers:
+            return cls._execute_timed(inputs, files, savepoint, **kwargs)
+
         instance = cls(inputs, files, **kwargs)
         instance.service_clean()
-        with instance._process_context():
-            return instance.process()
+        if cls.memoize is not None:
+            return cls.memoize.execute(instance, savepoint=savepoint)
+        return instance._run_process(savepoint=savepoint)
+
+    @classmethod
+    def prewarm(cls):
+        """
+        Loads what the Service otherwise loads on first use, like the
+        models of :class:`ModelField` declared by dotted name.  Call it
+        from ``AppConfig.ready`` for services that should be ready before
+        their first call.
+        """
+        prewarm_fields(cls.base_fields)
+
+    @classmethod
+    def invalidate_memoized(cls, cleaned_data=None):
+        """
+        Forgets the result :attr:`memoize` cached for ``cleaned_data``, or
+        all the cached results of the Service if it is ``None``.
+        """
+        if cls.memoize is not None:
+            cls.memoize.invalidate(cls, cleaned_data)
 
+    @classmethod
+    async def aexecute(cls, inputs, files=None, savepoint=None, **kwargs):
+        """
+        Async version of :meth:`execute`, for use in async views and
+        tasks.  Supports both regular and ``async def``
+        :meth:`process` and :meth:`post_process` methods.
+
+        When :meth:`process` is synchronous, validation, the transaction,
+        :meth:`process` and the commit all run in a single
+        ``sync_to_async`` call.  When it is a coroutine, only
+        instantiation and validation run in a thread before
+        :meth:`process` is awaited; as Django transactions can't span
+        ``await``, such services must set ``db_transaction = False`` or
+        be :attr:`read_only`.
+
+        Takes the same parameters as :meth:`execute`.
+        """
+        from asgiref.sync import sync_to_async
+
+        if not inspect.iscoroutinefunction(cls.process):
+            return await sync_to_async(cls.execute)(
+                inputs, files, savepoint=savepoint, **kwargs)
+
+        if cls.db_transaction and not cls.read_only:
+            raise ImproperlyConfigured(
+                "{} has an async process(), which can't run inside a "
+                "database transaction. Set db_transaction = False.".format(
+                    cls.__name__))
+
+        timer = PhaseTimer(cls) if service_phase_timed.receivers else None
+        instance = await sync_to_async(cls._validated)(
+            timer, inputs, files, **kwargs)
+
+        read_database = cls.get_read_database() if cls.read_only else None
+        with timer.phase('process') if timer else nullcontext():
+            with read_from(read_database):
+                result = await instance.process()
+
+        if (instance.run_post_process
+                and instance.post_process_executor is not None):
+            await sync_to_async(instance._post_process_callable(timer))()
+        elif instance.run_post_process:
+            post_process = instance.post_process
+            if not inspect.iscoroutinefunction(post_process):
+                post_process = sync_to_async(post_process)
+            with timer.phase('post_process') if timer else nullcontext():
+                await post_process()
+
+        return result
+
+    @classmethod
+    def _validated(cls, timer, inputs, files=None, **kwargs):
+        """
+        Returns an instance of the Service validated by
+        :meth:`service_clean`, timing both phases if ``timer`` is given.
+        """
+        with timer.phase('init') if timer else nullcontext():
+            instance = cls(inputs, files, **kwargs)
+        if timer is not None:
+            timer.using = instance.using
+
+        with timer.phase('clean') if timer else nullcontext():
+            instance.service_clean()
+        return instance
+
+    @classmethod
+    def _execute_timed(cls, inputs, files=None, savepoint=None, **kwargs):
+        """
+        Same as :meth:`execute`, sending :data:`service_phase_timed` for
+        every phase.
+        """
+        timer = PhaseTimer(cls)
+        instance = cls._validated(timer, inputs, files, **kwargs)
+        if cls.memoize is not None:
+            return cls.memoize.execute(instance, timer, savepoint)
+        return instance._run_process(timer, savepoint)
+
+    @classmethod
+    def execute_many(cls, inputs, batch_size=100, on_error='collect',
+                     **kwargs):
+        """
+        Executes the Service once for every item of ``inputs``.  Items are
+        consumed lazily in batches of ``batch_size``; every batch is
+        validated and then handed to :meth:`process_batch` inside a single
+        database transaction, so memory use stays bounded no matter how
+        large ``inputs`` is::
+
+            for item in CreatePerson.execute_many(rows, batch_size=500):
+                if item.error:
+                    log_invalid_row(item.index, item.error.errors)
+
+        Returns a generator of :class:`BatchResult`, one per item and in
+        input order.  Nothing is executed until the generator is iterated.
+
+        :param iterable inputs: iterable of data dictionaries, each one
+            checked against the fields defined on the Service class.
+
+        :param int batch_size: number of items validated and processed
+            per transaction.
+
+        :param string on_error: ``'collect'`` (default) reports invalid
+            items through :attr:`BatchResult.error` and processes the rest
+            of the batch, ``'raise'`` re-raises the first
+            :class:`InvalidInputsError`.  Batches already yielded stay
+            committed.  Exceptions raised from :meth:`process` always
+            propagate and roll back the current batch.
+
+        :param dictionary **kwargs: any additional parameters Service may
+            need, passed to every instance
+        """
+        if on_error not in ('collect', 'raise'):
+            raise ValueError(
+                "on_error must be 'collect' or 'raise', got {!r}".format(
+                    on_error))
+        if batch_size < 1:
+            raise ValueError('batch_size must be a positive integer')
+
+        items = iter(inputs)
+        index = 0
+        while True:
+            batch = list(islice(items, batch_size))
+            if not batch:
+                return
+
+            outcomes = []
+            instances = []
+            for data in batch:
+                instance = cls(data, **kwargs)
+                try:
+                    instance.service_clean()
+                except InvalidInputsError as e:
+                    if on_error == 'raise':
+                        raise
+                    outcomes.append(e)
+                else:
+                    outcomes.append(instance)
+                    instances.append(instance)
+
+            results = []
+            if instances:
+                with cls._batch_context(instances):
+                    results = list(cls.process_batch(instances))
+                    if len(results) != len(instances):
+                        raise ValueError(
+                            '{}.process_batch returned {} results for {} '
+                            'instances'.format(
+                                cls.__name__, len(results), len(instances)))
+
+            results = iter(results)
+            for outcome in outcomes:
+                if isinstance(outcome, InvalidInputsError):
+                    yield BatchResult(index, None, outcome)
+                else:
+                    yield BatchResult(index, next(results), None)
+                index += 1
+
+    @classmethod
+    def process_batch(cls, instances):
+        """
+        Processes a batch of validated Service instances for
+        :meth:`execute_many`.  By default calls :meth:`process` on each
+        instance; override it to replace per-item work with bulk
+        operations such as ``bulk_create``.
+
+        :param list instances: validated instances of the Service
+
+        :return: list with one result per instance, in the same order;
+            :meth:`execute_many` raises :class:`ValueError` and rolls the
+            batch back otherwise
+        """
+        return [instance.process() for instance in instances]
+
+    @abc.abstractmethod
     def service_clean(self):
         """
-        Calls base Form's :meth:`is_valid` to verify ``inputs`` against
-        Service's fields and raises :class:`InvalidInputsError` if necessary.
+        Validates ``inputs`` against the Service's fields, populating
+        ``cleaned_data``.  Raises :class:`InvalidInputsError` if they
+        are invalid.
         """
-        if not self.is_valid():
-            raise InvalidInputsError(self.errors, self.non_field_errors())
+        pass
 
     @abc.abstractmethod
     def process(self):
@@ -96,21 +513,175 @@ class Service(forms.Form):
         """
         pass
 
+    @classmethod
+    def should_retry(cls, exception):
+        """
+        Returns ``True`` if :meth:`process` should run again after
+        ``exception`` rolled back its transaction.  By default only
+        deadlocks and serialization failures of :attr:`using`'s database
+        backend are retried.
+        """
+        return is_retryable(exception, transaction.get_connection(cls.using))
+
+    def _run_process(self, timer=None, savepoint=None):
+        """
+        Runs :meth:`process` in its context.  With :attr:`retry_attempts`,
+        runs it again when :meth:`should_retry` accepts the exception
+        which rolled back its transaction, unless the transaction already
+        committed or belongs to an outer one.
+        """
+        if (not self.retry_attempts or self.read_only
+                or not self.db_transaction
+                or transaction.get_connection(self.using).in_atomic_block):
+            return self._run_attempt(timer, savepoint)
+
+        attempt = 0
+        while True:
+            committed = []
+            try:
+                return self._run_attempt(timer, savepoint, committed)
+            except DatabaseError as e:
+                attempt += 1
+                if (committed or attempt > self.retry_attempts
+                        or not self.should_retry(e)):
+                    raise
+                delay = backoff(
+                    attempt, self.retry_backoff, self.retry_max_backoff)
+                service_retried.send(
+                    sender=type(self),
+                    attempt=attempt,
+                    delay=delay,
+                    using=self.using,
+                    exception=e,
+                )
+                sleep(delay)
+                self.prepare_retry()
+
+    def prepare_retry(self):
+        """
+        Called before :meth:`process` runs again after its transaction
+        was rolled back.  Reloads the saved model instances of
+        ``cleaned_data``, directly or in lists, from the database, so
+        changes made in memory by the failed attempt are discarded, and
+        replaces querysets by fresh copies.  Override it to reset any
+        other state :meth:`process` relies on.
+        """
+        cleaned_data = self.cleaned_data
+        for name, value in cleaned_data.items():
+            if isinstance(value, QuerySet):
+                cleaned_data[name] = value.all()
+                continue
+            if not isinstance(value, (list, tuple)):
+                value = [value]
+            for item in value:
+                if isinstance(item, models.Model) and item.pk is not None:
+                    item.refresh_from_db()
+
+    def _run_attempt(self, timer=None, savepoint=None, committed=None):
+        if timer is not None:
+            timer.committing = None
+        with self._process_context(timer, savepoint, committed):
+            if timer is None:
+                return self.process()
+            with timer.phase('process'):
+                return self.process()
+
     @contextmanager
-    def _process_context(self):
+    def _process_context(self, timer=None, savepoint=None, committed=None):
         """
-        Returns the context for :meth:`process`
-        :return:
+        Returns the context for :meth:`process`.  ``committed``, a list,
+        gets an item once the transaction commits, before
+        :meth:`post_process` runs.
         """
-        if self.db_transaction:
-            with transaction.atomic(using=self.using):
-                if self.run_post_process:
-                    transaction.on_commit(self.post_process)
+        if savepoint is None:
+            savepoint = self.savepoint
+        post_process = self._post_process_callable(timer)
+
+        if self.read_only:
+            with read_from(self.get_read_database()):
                 yield
+            if self.run_post_process:
+                post_process()
+        elif self.db_transaction:
+            with timer.commit() if timer else nullcontext():
+                with service_transaction(self.using, savepoint):
+                    if committed is not None:
+                        transaction.on_commit(
+                            lambda: committed.append(True), using=self.using)
+                    if self.run_post_process:
+                        transaction.on_commit(post_process, using=self.using)
+                    yield
+                    if timer is not None:
+                        timer.mark()
         else:
             yield
             if self.run_post_process:
-                self.post_process()
+                post_process()
+
+    def _post_process_callable(self, timer=None):
+        """
+        Returns a synchronous callable running :meth:`post_process`,
+        through :attr:`post_process_executor` if there is one.
+        """
+        post_process = self.post_process
+        if inspect.iscoroutinefunction(post_process):
+            from asgiref.sync import async_to_sync
+            post_process = async_to_sync(post_process)
+        if timer is not None:
+            post_process = timer.timed('post_process', post_process)
+        return self._deferred(post_process)
+
+    @classmethod
+    def _deferred(cls, func):
+        """
+        Returns ``func``, or a callable submitting it to
+        :attr:`post_process_executor` if there is one.
+        """
+        if cls.post_process_executor is None:
+            return func
+        return partial(cls.post_process_executor.submit, func)
+
+    @classmethod
+    @contextmanager
+    def _batch_context(cls, instances):
+        """
+        Returns the context for :meth:`process_batch`.  Same as
+        :meth:`_process_context` but opens a single transaction and
+        registers a single ``on_commit`` hook for all ``instances``.
+        """
+        def post_process():
+            for instance in instances:
+                instance._post_process_callable()()
+
+        if cls.read_only:
+            with read_from(cls.get_read_database()):
+                yield
+            if cls.run_post_process:
+                post_process()
+        elif cls.db_transaction:
+            with service_transaction(cls.using, cls.savepoint):
+                if cls.run_post_process:
+                    transaction.on_commit(post_process, using=cls.using)
+                yield
+        else:
+            yield
+            if cls.run_post_process:
+                post_process()
+
+    @classmethod
+    def get_read_database(cls):
+        """
+        Returns the database alias reads of a :attr:`read_only` Service
+        are sent to: :attr:`using` once the request wrote to the database
+        (see :class:`~service_objects.routers.StickyPrimaryMiddleware`),
+        otherwise one of :attr:`replicas` picked at random.  ``None``
+        leaves the choice to the database routers.
+        """
+        if primary_pinned():
+            return cls.using
+        if cls.replicas:
+            return random.choice(cls.replicas)
+        return None
 
     def post_process(self):
         """
@@ -120,6 +691,124 @@ class Service(forms.Form):
         pass
 
 
+class Service(six.with_metaclass(ServiceMetaclass, BaseService, forms.Form)):
+    """
+    Based on Django's :class:`Form`, designed to encapsulate
+    Business Rules functionality.  Input values are validated against
+    the Service's defined fields before calling main functionality::
+
+        class UpdateUserEmail(Service):
+            user = ModelField(User)
+            new_email = forms.EmailField()
+
+            def process(self):
+                old_email = user.email
+                user.email = self.cleaned_data['new_email']
+                user.save()
+
+                send_email(
+                    'Email Update',
+                    'Your email was changed',
+                    'system',
+                    [old_email]
+                )
+
+
+        user = User.objects.get(id=20)
+
+        UpdateUserEmail.execute({
+            'user': user,
+            'new_email': 'John.Smith@example.com'
+        })
+
+
+    :cvar boolean db_transaction: controls if :py:meth:`execute`
+        is performed inside a Django database transaction.  Default
+        is True.
+
+    :cvar string using: In a multiple database setup, controls which
+        database connection is used from the transaction.  Defaults
+        to DEFAULT_DB_ALIAS which works in a single database setup.
+
+    :cvar boolean savepoint: when executed from another service's
+        :meth:`process` on the same database, whether to run in a
+        savepoint that can be rolled back alone, or to join the outer
+        transaction without one (failures then roll back the outer
+        service too).  Can be overridden per call of :meth:`execute`.
+        Default is True.
+
+    :cvar boolean read_only: run :meth:`process` without a transaction,
+        with its reads routed to a replica by
+        :class:`~service_objects.routers.ServiceRouter`.  Default is
+        False.
+
+    :cvar list replicas: database aliases a :attr:`read_only` Service
+        reads from, one picked at random per execution.  By default the
+        database routers choose.
+
+    :cvar memoize: a :class:`~service_objects.memoization.Memoize` caching
+        the results of :meth:`process` by ``cleaned_data``, for services
+        without side effects.  Default is None.
+
+    :cvar int retry_attempts: number of times :meth:`process` is run
+        again when its transaction is rolled back by a deadlock or a
+        serialization failure (see :meth:`should_retry`), each retry
+        reported through :data:`service_retried`.  Validation is not
+        repeated: model instances of ``cleaned_data`` are reloaded by
+        :meth:`prepare_retry`, but :meth:`process` must not rely on other
+        state changed by the failed attempt.  :meth:`post_process` only
+        runs after the attempt which committed.  Services running inside
+        another transaction are never retried.  Default is 0.
+
+    :cvar float retry_backoff: upper bound in seconds of the random delay
+        before the first retry, doubled for every further retry.
+        Default is 0.05.
+
+    :cvar float retry_max_backoff: cap in seconds of the delay between
+        retries.  Default is 1.0.
+
+    :cvar post_process_executor: a
+        :class:`~service_objects.executors.PostProcessExecutor` (or any
+        object with a ``submit(func)`` method) running
+        :meth:`post_process` in the background, so the caller doesn't
+        wait for it.  Default is None.
+
+    :cvar boolean share_fields: share field definitions between instances
+        instead of deep-copying them on every instantiation.  Instances
+        get a copy-on-write :class:`FieldsView`; use
+        :meth:`FieldsView.mutable` before modifying a field in place.
+        Default is False.
+
+    :cvar boolean fast_validation: validate inputs in :meth:`service_clean`
+        with a validator compiled once per class, skipping widgets' and
+        bound fields' overhead.  Services customizing
+        :class:`Form` internals automatically fall back to the regular
+        validation.  Default is True.
+
+    """
+
+    fast_validation = True
+    share_fields = False
+
+    def service_clean(self):
+        """
+        Calls base Form's :meth:`is_valid` to verify ``inputs`` against
+        Service's fields and raises :class:`InvalidInputsError` if necessary.
+        """
+        if self._pk_fields and self._errors is None:
+            self.data = resolve_pks({
+                self.add_prefix(name): self.fields[name]
+                for name in self._pk_fields if name in self.fields
+            }, self.data)
+
+        validator = self._validator
+        if validator is not None and validator.applies_to(self):
+            validator.full_clean(self)
+
+        if not self.is_valid():
+            raise InvalidInputsError(self.errors, self.non_field_errors())
+
+
 class ModelServiceMetaclass(ServiceMetaclass, ModelFormMetaclass):
     pass
 
@@ -167,3 +856,134 @@ class ModelService(six.with_metaclass(ModelServiceMetaclass, Service)):
         })
     """
     pass
+
+
+class LightServiceMetaclass(abc.ABCMeta, DeclarativeFieldsMetaclass):
+    def __new__(mcs, name, bases, attrs):
+        # Keep the slotted layout in subclasses without their own slots.
+        attrs.setdefault('__slots__', ())
+        new_class = super(LightServiceMetaclass, mcs).__new__(
+            mcs, name, bases, attrs)
+
+        new_class._steps = tuple(
+            (name, field.clean, getattr(new_class, 'clean_%s' % name, None))
+            for name, field in new_class.base_fields.items()
+        )
+        new_class._pk_fields = pk_fields(new_class.base_fields)
+
+        return new_class
+
+
+@six.add_metaclass(LightServiceMetaclass)
+class LightService(BaseService):
+    """
+    Same as :class:`Service` but not based on Django's :class:`Form`.
+    Fields are declared and validated the same way, but inputs are passed
+    to the fields' ``clean`` as they are, without widgets or bound fields,
+    and instances only hold ``data``, ``files``, ``cleaned_data`` and
+    ``errors`` in ``__slots__``.  Meant for services called from other
+    services or tasks at a high rate::
+
+        class IncrementCounter(LightService):
+            counter = ModelField(Counter)
+            amount = forms.IntegerField(min_value=1)
+
+            def process(self):
+                counter = self.cleaned_data['counter']
+                counter.value = F('value') + self.cleaned_data['amount']
+                counter.save(update_fields=['value'])
+
+
+        IncrementCounter.execute({'counter': counter, 'amount': 1})
+
+    Subclasses get an empty ``__slots__`` unless they declare their own;
+    those storing extra state on ``self`` must declare it there.
+    """
+    __slots__ = ('data', 'files', 'cleaned_data', 'errors')
+
+    error_class = ErrorList
+
+    def __init__(self, inputs=None, files=None):
+        self.data = {} if inputs is None else inputs
+        self.files = {} if files is None else files
+        self.cleaned_data = None
+        self.errors = None
+
+    def service_clean(self):
+        """
+        Verifies ``inputs`` against Service's fields, calling
+        ``clean_<name>`` methods and :meth:`clean` like a :class:`Form`
+        would, and raises :class:`InvalidInputsError` if necessary.
+        """
+        self.errors = ErrorDict()
+        self.cleaned_data = {}
+        data = self.data
+        if self._pk_fields:
+            data = resolve_pks({
+                name: self.base_fields[name] for name in self._pk_fields
+            }, data)
+
+        for name, clean, hook in self._steps:
+            try:
+                self.cleaned_data[name] = clean(data.get(name))
+                if hook is not None:
+                    self.cleaned_data[name] = hook(self)
+            except ValidationError as e:
+                self.add_error(name, e)
+
+        try:
+            cleaned_data = self.clean()
+        except ValidationError as e:
+            self.add_error(None, e)
+        else:
+            if cleaned_data is not None:
+                self.cleaned_data = cleaned_data
+
+        if self.errors:
+            raise InvalidInputsError(self.errors, self.non_field_errors())
+
+    def clean(self):
+        """
+        Hook for validation across fields, same as :meth:`Form.clean`.
+        """
+        return self.cleaned_data
+
+    def add_error(self, field, error):
+        """
+        Adds ``error`` to ``field``'s errors (or to the non field errors if
+        ``field`` is ``None``), same as :meth:`Form.add_error`.
+        """
+        if not isinstance(error, ValidationError):
+            error = ValidationError(error)
+
+        if hasattr(error, 'error_dict'):
+            if field is not None:
+                raise TypeError(
+                    "The argument `field` must be `None` when the `error` "
+                    "argument contains errors for multiple fields.")
+            error = error.error_dict
+        else:
+            error = {field or NON_FIELD_ERRORS: error.error_list}
+
+        for field, error_list in error.items():
+            if field not in self.errors:
+                if field != NON_FIELD_ERRORS and \
+                        field not in self.base_fields:
+                    raise ValueError("'{}' has no field named '{}'.".format(
+                        type(self).__name__, field))
+                if field == NON_FIELD_ERRORS:
+                    self.errors[field] = self.error_class(
+                        error_class='nonfield')
+                else:
+                    self.errors[field] = self.error_class()
+            self.errors[field].extend(error_list)
+            if field in self.cleaned_data:
+                del self.cleaned_data[field]
+
+    def non_field_errors(self):
+        """
+        Returns errors not associated with a particular field, same as
+        :meth:`Form.non_field_errors`.
+        """
+        return self.errors.get(
+            NON_FIELD_ERRORS, self.error_class(error_class='nonfield'))
@@ -0,0 +1,26 @@
+from django.dispatch import Signal
+
+#: Sent after every phase of :meth:`Service.execute` with the phase's
+#: timing.  ``sender`` is the Service class; receivers get the keyword
+#: arguments:
+#:
+#: * ``phase``: ``'init'``, ``'clean'``, ``'process'``, ``'commit'`` or
+#:   ``'post_process'``
+#: * ``duration``: wall time of the phase in seconds
+#: * ``using``: the database alias of the Service
+#: * ``outcome``: ``'success'``, ``'invalid'`` (the phase raised
+#:   :class:`InvalidInputsError`) or ``'error'``
+#: * ``exception``: the exception raised by the phase, or ``None``
+#:
+#: Executions are only timed while at least one receiver is connected.
+service_phase_timed = Signal()
+
+#: Sent before :meth:`Service.process` is run again after a deadlock or
+#: serialization failure (see :attr:`Service.retry_attempts`).
+#: ``sender`` is the Service class; receivers get the keyword arguments:
+#:
+#: * ``attempt``: number of the retry, starting at 1
+#: * ``delay``: seconds waited before the retry
+#: * ``using``: the database alias of the Service
+#: * ``exception``: the exception which rolled back the previous attempt
+service_retried = Signal()
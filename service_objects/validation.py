@@ -0,0 +1,184 @@
+import django
+from django import forms
+from django.forms.utils import ErrorDict
+
+
+# Methods of :class:`BaseForm` whose behaviour the compiled validator
+# reproduces.  Form classes overriding any of them are validated the usual
+# way.
+FORM_METHODS = (
+    '__init__',
+    'full_clean',
+    '_clean_fields',
+    '_clean_form',
+    '_post_clean',
+    'add_error',
+    'add_prefix',
+)
+
+
+def _is_overridden(cls, base, name):
+    return getattr(cls, name, None) is not getattr(base, name, None)
+
+
+class CompiledValidator(object):
+    """
+    Flat list of validation steps built once per form class by
+    :func:`compile_validator`.  Running it is equivalent to
+    :meth:`Form.full_clean` but skips bound fields: every step reads its
+    value straight from the form's data and calls the ``clean`` of the
+    form's own field and the form's ``clean_<name>`` method.
+
+    :ivar tuple names: field names, in validation order
+    :ivar tuple steps: ``(name, hook)`` tuples
+    """
+    __slots__ = ('names', 'steps', '_class_steps')
+
+    def __init__(self, steps, fields):
+        self.steps = tuple(steps)
+        self.names = tuple(step[0] for step in self.steps)
+        # Fields of the form class, for clean_data: ``(name, read, clean)``
+        # with ``read`` None when the value is a plain ``data.get(name)``.
+        self._class_steps = tuple(
+            (name, reader(fields[name]), fields[name].clean)
+            for name in self.names
+        )
+
+    def applies_to(self, form):
+        """
+        Returns ``True`` if ``form`` has not been validated yet and its
+        state is what the validator was compiled for.
+        """
+        return (
+            form._errors is None
+            and form.is_bound
+            and form.prefix is None
+            and not form.empty_permitted
+            and tuple(form.fields) == self.names
+            and all(is_compilable(field) for field in form.fields.values())
+        )
+
+    def full_clean(self, form):
+        """
+        Populates ``form``'s ``errors`` and ``cleaned_data``; same as
+        calling :meth:`Form.full_clean`.
+        """
+        form._errors = new_error_dict(form)
+        form.cleaned_data = {}
+        data = form.data
+        files = form.files
+        fields = form.fields
+
+        for name, hook in self.steps:
+            field = fields[name]
+            try:
+                value = read_value(field, data, files, name)
+                form.cleaned_data[name] = field.clean(value)
+                if hook is not None:
+                    form.cleaned_data[name] = hook(form)
+            except forms.ValidationError as e:
+                form.add_error(name, e)
+
+        form._clean_form()
+        form._post_clean()
+
+    @property
+    def has_hooks(self):
+        """
+        ``True`` if any field has a ``clean_<name>`` method, which
+        :meth:`clean_data` can't call.
+        """
+        return any(hook is not None for name, hook in self.steps)
+
+    def clean_data(self, data, files=None):
+        """
+        Validates ``data`` without a form instance, for validators
+        without hooks.  Returns ``(cleaned_data, errors)``; ``errors`` maps
+        field names to lists of messages and is empty if ``data`` is
+        valid.
+        """
+        cleaned_data = {}
+        errors = {}
+        for name, read, clean in self._class_steps:
+            try:
+                if read is None:
+                    value = data.get(name)
+                else:
+                    value = read(data, files or {}, name)
+                cleaned_data[name] = clean(value)
+            except forms.ValidationError as e:
+                errors[name] = e.messages
+        return cleaned_data, errors
+
+
+def new_error_dict(form):
+    if django.VERSION >= (4, 0):
+        return ErrorDict(renderer=form.renderer)
+    return ErrorDict()
+
+
+def is_compilable(field):
+    """
+    Returns ``False`` if ``field`` needs the bound field machinery:
+    disabled and file fields, or fields overriding how bound values are
+    cleaned.
+    """
+    return not (
+        field.disabled
+        or isinstance(field, forms.FileField)
+        or _is_overridden(type(field), forms.Field, '_clean_bound_field')
+    )
+
+
+def reader(field):
+    """
+    Returns the ``value_from_datadict`` of ``field``'s widget, or ``None``
+    if it doesn't customize it and values can be read with ``data.get``.
+    """
+    widget = field.widget
+    if _is_overridden(type(widget), forms.Widget, 'value_from_datadict'):
+        return widget.value_from_datadict
+    return None
+
+
+def read_value(field, data, files, name):
+    """
+    Returns the raw value of ``field`` from ``data``.
+    """
+    read = reader(field)
+    if read is None:
+        return data.get(name)
+    return read(data, files, name)
+
+
+def compile_step(form_class, name, field):
+    """
+    Returns the ``(name, hook)`` step validating field ``name``, or
+    ``None`` if ``field`` can't be validated without bound fields.
+    """
+    if not is_compilable(field):
+        return None
+    return name, getattr(form_class, 'clean_%s' % name, None)
+
+
+def compile_validator(form_class):
+    """
+    Builds a :class:`CompiledValidator` for ``form_class``.  Returns
+    ``None`` when the form customizes validation in a way the validator
+    can't reproduce, in which case the regular :class:`Form` path has to
+    be used.
+    """
+    if form_class.field_order is not None:
+        return None
+    for name in FORM_METHODS:
+        if _is_overridden(form_class, forms.BaseForm, name):
+            return None
+
+    steps = []
+    for name, field in form_class.base_fields.items():
+        step = compile_step(form_class, name, field)
+        if step is None:
+            return None
+        steps.append(step)
+
+    return CompiledValidator(steps, form_class.base_fields)
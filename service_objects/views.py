@@ -72,6 +72,59 @@ class ServiceViewMixin(object):
             return self.form_invalid(form)
 
 
+class AsyncServiceViewMixin(ServiceViewMixin):
+    """
+    Async version of :class:`ServiceViewMixin`; its handlers are
+    coroutines and the :class:`Service` is run with :meth:`aexecute`.
+    Requires Django 3.1 or later.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        return self.render_to_response(self.get_context_data())
+
+    async def post(self, request, *args, **kwargs):
+        from asgiref.sync import sync_to_async
+
+        form, valid = await sync_to_async(self.get_validated_form)()
+        if valid:
+            return await self.aform_valid(form)
+        return self.form_invalid(form)
+
+    def get_validated_form(self):
+        """
+        Returns the form and whether it is valid.  Run in a thread by
+        :meth:`post`, as building and validating forms may query the
+        database.
+        """
+        form = self.get_form()
+        return form, form.is_valid()
+
+    async def put(self, *args, **kwargs):
+        return await self.post(*args, **kwargs)
+
+    async def aform_valid(self, form):
+        """
+        Same as :meth:`form_valid` but awaits the :class:`Service`'s
+        :meth:`aexecute`.
+        """
+        try:
+            cls = self.get_service_class()
+            await cls.aexecute(
+                self.get_service_input(form),
+                self.get_service_files(),
+                **self.get_service_kwargs()
+            )
+            return super(ServiceViewMixin, self).form_valid(form)
+
+        except InvalidInputsError as e:
+            for k, v in viewitems(e.errors):
+                form.add_error(k, v)
+            return self.form_invalid(form)
+        except ValidationError as e:
+            form.add_error(None, e)
+            return self.form_invalid(form)
+
+
 class ServiceView(ServiceViewMixin, FormView):
     """
     Based on Django's :class:`FormView`, designed to call a
@@ -108,3 +161,12 @@ class UpdateServiceView(ServiceViewMixin, UpdateView):
     Based on Django's :class:`UpdateView`, designed to call the
     :class:`Service` class if the form is valid.
     """
+
+
+class AsyncServiceView(AsyncServiceViewMixin, FormView):
+    """
+    Same as :class:`ServiceView` but served asynchronously, awaiting the
+    :class:`Service`'s :meth:`aexecute`.  Lets the :class:`Service`
+    define ``async def process`` and avoids blocking a worker thread
+    per request.
+    """
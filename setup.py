@@ -25,7 +25,7 @@ os.chdir(os.path.normpath(os.path.join(os.path.abspath(__file__), os.path.pardir
 setup(
     name='django-service-objects',
     version=service_objects.__version__,
-    packages=find_packages(exclude=['test*']),
+    packages=find_packages(exclude=['test*', 'benchmarks*']),
     include_package_data=True,
     license=service_objects.__license__,
     description=service_objects.__doc__,
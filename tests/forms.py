@@ -1,5 +1,16 @@
 from django import forms
 
+from service_objects.fields import ModelField
+
 
 class FooForm(forms.Form):
     name = forms.CharField(max_length=5)
+
+
+class HookedFooForm(FooForm):
+    def clean_name(self):
+        return self.cleaned_data['name'].upper()
+
+
+class LazyModelFieldForm(forms.Form):
+    bar = ModelField('tests.BarModel')
@@ -1,10 +1,15 @@
 from django import forms
+from django.db import OperationalError
 
-from service_objects.fields import ModelField
+from service_objects.fields import (ModelField, MultipleFormField,
+                                    MultipleModelField)
 from service_objects.celery_services import CeleryService
-from service_objects.services import Service
+from service_objects.executors import PostProcessExecutor
+from service_objects.memoization import Memoize
+from service_objects.services import Service, LightService
 
-from .models import CustomFooModel
+from .forms import FooForm, LazyModelFieldForm
+from .models import CustomFooModel, FooModel
 
 
 class FooService(Service):
@@ -32,3 +37,211 @@ class FooModelService(CeleryService):
 
     def process(self):
         pass
+
+
+class CreateFooService(Service):
+    one = forms.CharField(max_length=1)
+
+    def process(self):
+        return FooModel.objects.create(one=self.cleaned_data['one'])
+
+
+class SharedFieldsService(Service):
+    share_fields = True
+
+    foo = ModelField(FooModel)
+    bar = forms.CharField(max_length=5)
+    items = MultipleFormField(FooForm, required=False)
+
+    def process(self):
+        return self.cleaned_data
+
+
+class LightFooService(LightService):
+    __slots__ = ('foo',)
+
+    one = forms.CharField(max_length=1)
+    two = forms.IntegerField(required=False)
+
+    def clean_one(self):
+        return self.cleaned_data['one'].upper()
+
+    def clean(self):
+        if self.cleaned_data.get('two') == 0:
+            raise forms.ValidationError('Zero is not allowed.')
+        return self.cleaned_data
+
+    def process(self):
+        self.foo = FooModel.objects.create(one=self.cleaned_data['one'])
+        return self.foo
+
+
+class MultipleFooModelService(CeleryService):
+    foo = ModelField(FooModel)
+    other_foo = ModelField(FooModel)
+    custom_foo = ModelField(CustomFooModel)
+
+    select_related = {'foo': ['owner']}
+    prefetch_related = {'other_foo': ['tags']}
+
+    def process(self):
+        pass
+
+
+class JSONFooModelService(FooModelService):
+    payload_codec = 'json'
+
+
+class LazyFooModelService(MultipleFooModelService):
+    select_related = {}
+    prefetch_related = {}
+    lazy_inflation = True
+
+
+class CopyFooService(CeleryService):
+    foo = ModelField(FooModel)
+    one = forms.CharField(max_length=1)
+
+    def process(self):
+        return FooModel.objects.create(one=self.cleaned_data['one'])
+
+
+class JSONCopyFooService(CopyFooService):
+    payload_codec = 'json'
+
+
+class OnCommitCopyFooService(CopyFooService):
+    dispatch_on_commit = True
+
+
+class QueuedCopyFooService(CopyFooService):
+    task_options = {"queue": "copy", "rate_limit": "10/s", "acks_late": True}
+
+
+class QueuedJSONCopyFooService(QueuedCopyFooService):
+    payload_codec = 'json'
+
+
+class MemoizedFooService(Service):
+    memoize = Memoize(max_entries=2)
+
+    foo = ModelField(FooModel)
+    number = forms.IntegerField()
+
+    calls = 0
+
+    def process(self):
+        type(self).calls += 1
+        return [self.cleaned_data['foo'].one] * self.cleaned_data['number']
+
+
+class DjangoMemoizedFooService(MemoizedFooService):
+    memoize = Memoize(ttl=60, backend='django')
+
+
+class UnsavedMemoizedFooService(Service):
+    memoize = Memoize()
+
+    foo = ModelField(FooModel, allow_unsaved=True)
+
+    def process(self):
+        return self.cleaned_data['foo'].one
+
+
+class PkFooService(Service):
+    foo = ModelField(FooModel, accept_pk=True)
+    other_foo = ModelField(FooModel, accept_pk=True, required=False)
+    foos = MultipleModelField(FooModel, accept_pk=True, required=False)
+    custom_foo = ModelField(CustomFooModel, accept_pk=True, required=False)
+
+    def process(self):
+        return self.cleaned_data
+
+
+class LightPkFooService(LightService):
+    foo = ModelField(FooModel, accept_pk=True)
+    foos = MultipleModelField(FooModel, accept_pk=True, required=False)
+
+    def process(self):
+        return self.cleaned_data
+
+
+class LazyModelFieldService(Service):
+    foo = ModelField('tests.FooModel')
+    people = MultipleFormField(LazyModelFieldForm, required=False)
+
+    def process(self):
+        return self.cleaned_data['foo']
+
+
+class JoinedCreateFooService(CreateFooService):
+    savepoint = False
+
+
+class CompositeFooService(Service):
+    count = forms.IntegerField()
+    joined = forms.BooleanField(required=False)
+    inner_savepoint = forms.NullBooleanField(required=False)
+
+    def process(self):
+        inner = CreateFooService
+        if self.cleaned_data['joined']:
+            inner = JoinedCreateFooService
+        return [
+            inner.execute(
+                {'one': 'a'}, savepoint=self.cleaned_data['inner_savepoint'])
+            for _ in range(self.cleaned_data['count'])
+        ]
+
+
+class ReadFooService(Service):
+    read_only = True
+    replicas = ['replica']
+
+    one = forms.CharField(max_length=1)
+
+    def process(self):
+        return list(FooModel.objects.filter(
+            one=self.cleaned_data['one']).values_list('one', flat=True))
+
+
+class RoutedReadFooService(ReadFooService):
+    replicas = None
+
+
+class RetryFooService(Service):
+    retry_attempts = 2
+
+    one = forms.CharField(max_length=1)
+    failures = forms.IntegerField(min_value=0)
+
+    def process(self):
+        self.attempts = getattr(self, 'attempts', 0) + 1
+        foo = FooModel.objects.create(one=self.cleaned_data['one'])
+        if self.attempts <= self.cleaned_data['failures']:
+            raise OperationalError('database is locked')
+        return foo
+
+
+class BackgroundFooService(Service):
+    post_process_executor = PostProcessExecutor(max_workers=1)
+
+    one = forms.CharField(max_length=1)
+
+    def process(self):
+        return self.cleaned_data['one']
+
+
+class RetryUpdateFooService(Service):
+    retry_attempts = 1
+
+    foo = ModelField(FooModel)
+
+    def process(self):
+        foo = self.cleaned_data['foo']
+        foo.one = chr(ord(foo.one) + 1)
+        foo.save()
+        if not getattr(self, 'failed', False):
+            self.failed = True
+            raise OperationalError('database is locked')
+        return foo
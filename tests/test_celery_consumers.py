@@ -0,0 +1,113 @@
+try:
+    from unittest.mock import patch
+except ImportError:
+    from mock import patch
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase
+from kombu import Connection
+
+from service_objects.celery_consumers import BatchConsumer
+
+from tests.models import FooModel
+from tests.services import (CopyFooService, QueuedCopyFooService,
+                            QueuedJSONCopyFooService)
+
+
+class BatchConsumerTest(TestCase):
+    def setUp(self):
+        self.foo = FooModel.objects.create(one="a")
+        self.connection = Connection("memory://")
+        self.addCleanup(self.connection.release)
+
+        self.consumer = BatchConsumer(
+            QueuedCopyFooService, batch_size=2, timeout=0.01)
+        queue = self.consumer.queue(self.connection.default_channel)
+        queue.declare()
+        queue.purge()
+
+    def send(self, service_class, *ones):
+        cleaned_data = [
+            service_class._deflate_models({"foo": self.foo, "one": one})
+            for one in ones
+        ]
+        if len(cleaned_data) == 1:
+            signature = service_class._task_signature(cleaned_data[0])
+        else:
+            signature = service_class._task_signature(cleaned_data, many=True)
+        signature.apply_async(connection=self.connection)
+
+    def ones(self):
+        return list(FooModel.objects.order_by("pk").values_list(
+            "one", flat=True))
+
+    def test_batches(self):
+        for one in "bcd":
+            self.send(QueuedCopyFooService, one)
+
+        self.assertEqual(2, len(self.consumer.drain(self.connection)))
+        self.assertEqual(["a", "b", "c"], self.ones())
+        self.assertEqual(1, len(self.consumer.drain(self.connection)))
+        self.assertEqual([], self.consumer.drain(self.connection))
+        self.assertEqual(["a", "b", "c", "d"], self.ones())
+
+    def test_models_fetched_together(self):
+        self.send(QueuedCopyFooService, "b")
+        self.send(QueuedCopyFooService, "c")
+
+        with patch.object(QueuedCopyFooService, "_fetch_models",
+                          wraps=QueuedCopyFooService._fetch_models) as fetch:
+            self.consumer.drain(self.connection)
+
+        self.assertEqual(1, fetch.call_count)
+
+    def test_failures_are_isolated(self):
+        process = QueuedCopyFooService.process
+
+        def fail_on_x(service):
+            if service.cleaned_data["one"] == "x":
+                raise ValueError
+            return process(service)
+
+        other = FooModel.objects.create(one="z")
+        self.send(QueuedCopyFooService, "x")
+        QueuedCopyFooService._task_signature(
+            {"foo": (FooModel, other.pk), "one": "y"}
+        ).apply_async(connection=self.connection)
+        other.delete()
+        self.send(QueuedCopyFooService, "b")
+
+        consumer = BatchConsumer(
+            QueuedCopyFooService, batch_size=3, timeout=0.01)
+        with patch.object(QueuedCopyFooService, "process", fail_on_x), \
+                self.assertLogs("service_objects.celery_consumers") as logs:
+            results = consumer.drain(self.connection)
+
+        self.assertIsInstance(results[0].error, ValueError)
+        self.assertIsInstance(results[1].error, FooModel.DoesNotExist)
+        self.assertIsNone(results[2].error)
+        self.assertEqual(2, len(logs.records))
+        self.assertEqual(["a", "b"], self.ones())
+        self.assertEqual([], consumer.drain(self.connection))
+
+    def test_json_chunks(self):
+        consumer = BatchConsumer(
+            QueuedJSONCopyFooService, queue="copy", timeout=0.01)
+        self.send(QueuedJSONCopyFooService, "b", "c")
+        self.send(QueuedJSONCopyFooService, "d")
+
+        self.assertEqual(3, len(consumer.drain(self.connection)))
+        self.assertEqual(["a", "b", "c", "d"], self.ones())
+
+    def test_other_tasks_requeued(self):
+        self.send(QueuedJSONCopyFooService, "b")
+
+        self.assertEqual([], self.consumer.drain(self.connection))
+        self.assertEqual(["a"], self.ones())
+
+        consumer = BatchConsumer(QueuedJSONCopyFooService, timeout=0.01)
+        self.assertEqual(1, len(consumer.drain(self.connection)))
+
+    def test_needs_task_options(self):
+        with self.assertRaises(ImproperlyConfigured):
+            BatchConsumer(CopyFooService)
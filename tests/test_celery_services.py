@@ -1,17 +1,31 @@
 import datetime
 
 try:
-    from unittest.mock import Mock, patch
+    from unittest.mock import MagicMock, Mock, patch
 except ImportError:
-    from mock import Mock, patch
+    from mock import MagicMock, Mock, patch
+import json
 import pickle
+import sys
 
+from asgiref.sync import async_to_sync
+from django.db import connection, transaction
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
-from service_objects.celery_services import celery_service_task, CeleryService
+from service_objects.celery_services import (
+    celery_service_task, celery_service_chunk_task,
+    celery_service_payload_task, get_service_class, CeleryService,
+    OnCommitPublisher)
+from service_objects.errors import InvalidInputsError
+from service_objects.codecs import get_codec
 
-from tests.models import CustomFooModel
-from tests.services import FooModelService
+from tests.models import CustomFooModel, FooModel
+from tests.services import (CopyFooService, FooModelService,
+                            JSONCopyFooService, JSONFooModelService,
+                            LazyFooModelService, MultipleFooModelService,
+                            OnCommitCopyFooService, QueuedCopyFooService,
+                            QueuedJSONCopyFooService)
 
 
 class CeleryServiceTest(TestCase):
@@ -70,3 +84,474 @@ class CeleryServiceTest(TestCase):
                 FooModelService.execute(self.initial_data)
                 self.assertTrue(d["celery_task_dispatched"])
                 self.assertEqual(d["cleaned_data"], self.initial_data)
+
+    def test_aexecute_savepoint(self):
+        with patch.object(celery_service_task, "apply_async") as apply_async, \
+                patch.object(FooModelService, "process") as process:
+            async_to_sync(FooModelService.aexecute)(
+                self.initial_data, savepoint=True)
+
+        apply_async.assert_called_once()
+        process.assert_not_called()
+
+    def test_execute_sync_savepoint(self):
+        with patch.object(FooModelService, "process",
+                          return_value="done") as process:
+            self.assertEqual("done", FooModelService.execute(
+                self.initial_data, sync=True, savepoint=False))
+
+        process.assert_called_once_with()
+
+
+class PayloadCodecTest(TestCase):
+    def setUp(self):
+        self.foo = CustomFooModel.objects.create(custom_pk="custom", one="a")
+        self.initial_data = {
+            "foo": self.foo,
+            "date": datetime.date.today(),
+            "text": "text",
+        }
+
+    def test_service_key(self):
+        self.assertEqual("tests.services:JSONFooModelService",
+                         JSONFooModelService.get_service_key())
+        self.assertIs(JSONFooModelService,
+                      get_service_class("tests.services:JSONFooModelService"))
+
+        with self.assertRaises(LookupError):
+            get_service_class("tests.services:FooService")
+
+    def test_service_key_does_not_import(self):
+        with self.assertRaises(LookupError):
+            get_service_class("tests.unimported:Service")
+        self.assertNotIn("tests.unimported", sys.modules)
+
+    def test_json_payload_reaching_executor(self):
+        d = {"options": None, "cleaned_data": None}
+
+        def apply_async(args, kwargs, **options):
+            d["options"] = options
+            args, kwargs = json.loads(json.dumps([args, kwargs]))
+            return celery_service_payload_task.apply(args, kwargs)
+
+        def process(_self):
+            d["cleaned_data"] = _self.cleaned_data
+
+        with patch.object(celery_service_payload_task, "apply_async",
+                          apply_async), \
+                patch.object(JSONFooModelService, "process", process):
+            JSONFooModelService.execute(self.initial_data)
+
+        self.assertEqual({"serializer": "json"}, d["options"])
+        self.assertEqual(self.initial_data, d["cleaned_data"])
+
+    def assertSmallerThanPickle(self, cleaned_data):
+        pickled = pickle.dumps(((cleaned_data,),
+                                {"service_class": JSONFooModelService}))
+        encoded = json.dumps(((get_codec("json").encode(
+            JSONFooModelService.get_service_key(), cleaned_data),),
+            {"codec": "json"}))
+
+        self.assertLess(len(encoded), len(pickled))
+
+    def test_payload_size(self):
+        service = JSONFooModelService(self.initial_data)
+        service.service_clean()
+
+        self.assertSmallerThanPickle(
+            JSONFooModelService._deflate_models(service.cleaned_data))
+
+    def test_list_payload_size(self):
+        FooModel.objects.bulk_create(FooModel(one="a") for _ in range(100))
+
+        self.assertSmallerThanPickle({"foos": CeleryService._deflate_model(
+            list(FooModel.objects.all()))})
+
+    def test_nested_payload_size(self):
+        self.assertSmallerThanPickle({"rows": [
+            {"date": datetime.date.today(), "n": i, "tags": ["a", "b"]}
+            for i in range(100)
+        ]})
+
+
+class InflateModelsTest(TestCase):
+    def setUp(self):
+        self.foo = FooModel.objects.create(one="a")
+        self.other_foo = FooModel.objects.create(one="b")
+        self.custom_foo = CustomFooModel.objects.create(
+            custom_pk="custom", one="c")
+        self.deflated = {
+            "foo": (FooModel, self.foo.pk),
+            "other_foo": (FooModel, self.other_foo.pk),
+            "custom_foo": (CustomFooModel, self.custom_foo.pk),
+            "text": "text",
+        }
+
+    def test_one_query_per_model_class(self):
+        with self.assertNumQueries(2):
+            inflated = CeleryService._inflate_models(self.deflated)
+
+        self.assertEqual({
+            "foo": self.foo,
+            "other_foo": self.other_foo,
+            "custom_foo": self.custom_foo,
+            "text": "text",
+        }, inflated)
+
+    def test_same_object(self):
+        deflated = {"foo": (FooModel, self.foo.pk),
+                    "other_foo": (FooModel, self.foo.pk)}
+
+        with self.assertNumQueries(1):
+            inflated = CeleryService._inflate_models(deflated)
+
+        self.assertEqual(self.foo, inflated["foo"])
+        self.assertEqual(self.foo, inflated["other_foo"])
+
+    def test_deleted_object(self):
+        self.other_foo.delete()
+
+        with self.assertRaises(FooModel.DoesNotExist):
+            CeleryService._inflate_models(self.deflated)
+
+    def test_related_hints(self):
+        queryset = MultipleFooModelService._get_inflate_queryset(
+            FooModel, ["foo", "other_foo"])
+
+        self.assertEqual({"owner": {}}, queryset.query.select_related)
+        self.assertEqual(("tags",), queryset._prefetch_related_lookups)
+
+        queryset = MultipleFooModelService._get_inflate_queryset(
+            CustomFooModel, ["custom_foo"])
+
+        self.assertFalse(queryset.query.select_related)
+        self.assertFalse(queryset._prefetch_related_lookups)
+
+    def test_deflate_lists(self):
+        foos = [self.other_foo, self.foo]
+
+        self.assertEqual((FooModel, [self.other_foo.pk, self.foo.pk]),
+                         CeleryService._deflate_model(foos))
+        self.assertEqual((FooModel, [self.other_foo.pk, self.foo.pk]),
+                         CeleryService._deflate_model(tuple(foos)))
+        self.assertEqual(
+            (FooModel, [self.foo.pk, self.other_foo.pk]),
+            CeleryService._deflate_model(FooModel.objects.order_by("pk")))
+
+    def test_deflate_lists_not_models(self):
+        unsaved = [self.foo, FooModel(one="c")]
+        mixed = [self.foo, self.custom_foo]
+
+        self.assertIs(unsaved, CeleryService._deflate_model(unsaved))
+        self.assertIs(mixed, CeleryService._deflate_model(mixed))
+        self.assertEqual([], CeleryService._deflate_model([]))
+        self.assertEqual(["a"], CeleryService._deflate_model(["a"]))
+
+    def test_inflate_lists_in_order(self):
+        deflated = {
+            "foos": (FooModel, [self.other_foo.pk, self.foo.pk,
+                                self.other_foo.pk]),
+            "foo": (FooModel, self.foo.pk),
+        }
+
+        with self.assertNumQueries(1):
+            inflated = CeleryService._inflate_models(deflated)
+
+        self.assertEqual([self.other_foo, self.foo, self.other_foo],
+                         inflated["foos"])
+        self.assertEqual(self.foo, inflated["foo"])
+        self.assertEqual([self.other_foo, self.foo],
+                         CeleryService._inflate_model(
+                             (FooModel, [self.other_foo.pk, self.foo.pk])))
+
+    def test_inflate_lists_deleted_object(self):
+        deflated = {"foos": (FooModel, [self.foo.pk, self.other_foo.pk])}
+        self.foo.delete()
+
+        with self.assertRaises(FooModel.DoesNotExist):
+            CeleryService._inflate_models(deflated)
+
+    def test_deflated_lists_are_smaller(self):
+        FooModel.objects.bulk_create(FooModel(one="x") for _ in range(100))
+        foos = list(FooModel.objects.all())
+
+        self.assertLess(
+            len(pickle.dumps(CeleryService._deflate_model(foos))) * 5,
+            len(pickle.dumps(foos)))
+
+
+class LazyInflationTest(TestCase):
+    def setUp(self):
+        self.foo = FooModel.objects.create(one="a")
+        self.other_foo = FooModel.objects.create(one="b")
+        self.custom_foo = CustomFooModel.objects.create(
+            custom_pk="custom", one="c")
+        self.deflated = {
+            "foo": (FooModel, self.foo.pk),
+            "other_foo": (FooModel, [self.other_foo.pk]),
+            "custom_foo": (CustomFooModel, self.custom_foo.pk),
+            "text": "text",
+        }
+
+    def test_no_queries_until_accessed(self):
+        with self.assertNumQueries(0):
+            cleaned_data = LazyFooModelService._inflate_models(self.deflated)
+            self.assertEqual("text", cleaned_data["text"])
+            self.assertIn("foo", cleaned_data)
+            self.assertEqual(4, len(cleaned_data))
+
+    def test_inflates_model_class_together(self):
+        cleaned_data = LazyFooModelService._inflate_models(self.deflated)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.foo, cleaned_data["foo"])
+            self.assertEqual([self.other_foo], cleaned_data.get("other_foo"))
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.custom_foo, cleaned_data["custom_foo"])
+
+    def test_items(self):
+        cleaned_data = LazyFooModelService._inflate_models(self.deflated)
+
+        with self.assertNumQueries(2):
+            self.assertEqual({
+                "foo": self.foo,
+                "other_foo": [self.other_foo],
+                "custom_foo": self.custom_foo,
+                "text": "text",
+            }, dict(cleaned_data.items()))
+
+    def test_unpacking(self):
+        cleaned_data = LazyFooModelService._inflate_models(self.deflated)
+        expected = {
+            "foo": self.foo,
+            "other_foo": [self.other_foo],
+            "custom_foo": self.custom_foo,
+            "text": "text",
+        }
+
+        self.assertEqual(expected, (lambda **kwargs: kwargs)(**cleaned_data))
+        self.assertEqual(expected, {**cleaned_data})
+        self.assertEqual(expected, dict(cleaned_data))
+
+    def test_overwritten_values_are_not_fetched(self):
+        cleaned_data = LazyFooModelService._inflate_models(self.deflated)
+        cleaned_data["foo"] = None
+        cleaned_data.update(other_foo=[])
+
+        with self.assertNumQueries(1):
+            cleaned_data.pop("custom_foo")
+            self.assertEqual({"foo": None, "other_foo": [], "text": "text"},
+                             cleaned_data)
+
+    def test_process_not_using_models(self):
+        with patch.object(LazyFooModelService, "process",
+                          lambda _self: _self.cleaned_data["text"]):
+            with CaptureQueriesContext(connection) as queries:
+                LazyFooModelService._inflate_and_execute(self.deflated)
+
+        self.assertFalse([
+            query for query in queries.captured_queries
+            if query["sql"].startswith("SELECT")
+        ])
+
+
+class ExecuteManyTest(TestCase):
+    def setUp(self):
+        self.foo = FooModel.objects.create(one="a")
+        self.other_foo = FooModel.objects.create(one="b")
+        self.inputs = [
+            {"foo": self.foo, "one": "c"},
+            {"foo": self.other_foo, "one": "d"},
+            {"foo": self.foo, "one": "e"},
+        ]
+
+        app = celery_service_chunk_task.app
+        eager = app.conf.task_always_eager
+        app.conf.task_always_eager = True
+        self.addCleanup(setattr, app.conf, "task_always_eager", eager)
+
+    def test_dispatches_chunks(self):
+        result = CopyFooService.execute_many(self.inputs, batch_size=2)
+
+        self.assertEqual(2, len(result.results))
+        self.assertEqual(["a", "b", "c", "d", "e"], list(
+            FooModel.objects.order_by("pk").values_list("one", flat=True)))
+
+    def test_chunk_inflated_at_once(self):
+        chunk = [CopyFooService._deflate_models(
+            {"foo": item["foo"], "one": item["one"]}) for item in self.inputs]
+
+        with CaptureQueriesContext(connection) as queries:
+            CopyFooService._inflate_and_execute_many(chunk)
+
+        self.assertEqual(1, len([
+            query for query in queries.captured_queries
+            if query["sql"].startswith("SELECT")
+        ]))
+
+    def test_invalid_inputs_dispatch_nothing(self):
+        with self.assertRaises(InvalidInputsError):
+            CopyFooService.execute_many(self.inputs + [{"one": "f"}])
+
+        self.assertEqual(2, FooModel.objects.count())
+
+    def test_json_codec(self):
+        signature = JSONCopyFooService._task_signature([
+            JSONCopyFooService._deflate_models(item) for item in self.inputs
+        ], many=True)
+        args, kwargs = json.loads(json.dumps(
+            [signature.args, signature.kwargs]))
+
+        self.assertEqual("json", signature.options["serializer"])
+        celery_service_chunk_task.apply(args, kwargs)
+        self.assertEqual(5, FooModel.objects.count())
+
+    def test_sync(self):
+        results = CopyFooService.execute_many(self.inputs, sync=True)
+
+        self.assertEqual(5, FooModel.objects.count())
+        self.assertEqual(["c", "d", "e"], [r.result.one for r in results])
+
+
+class DispatchOnCommitTest(TestCase):
+    def setUp(self):
+        self.foo = FooModel.objects.create(one="a")
+
+        app = celery_service_task.app
+        eager = app.conf.task_always_eager
+        app.conf.task_always_eager = True
+        self.addCleanup(setattr, app.conf, "task_always_eager", eager)
+
+        patcher = patch.object(app, "producer_or_acquire", MagicMock())
+        self.producer_or_acquire = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.hooks = len(connection.run_on_commit)
+
+    def run_commit_hooks(self):
+        hooks = connection.run_on_commit[self.hooks:]
+        del connection.run_on_commit[self.hooks:]
+        for hook in hooks:
+            hook[1]()
+
+    def ones(self):
+        return list(FooModel.objects.order_by("pk").values_list(
+            "one", flat=True))
+
+    def test_publishes_after_commit(self):
+        OnCommitCopyFooService.execute({"foo": self.foo, "one": "b"})
+        OnCommitCopyFooService.execute({"foo": self.foo, "one": "c"})
+
+        self.assertEqual(["a"], self.ones())
+        self.run_commit_hooks()
+        self.assertEqual(["a", "b", "c"], self.ones())
+        # Eager tasks reuse the producer they are given.
+        acquired = [
+            call for call in self.producer_or_acquire.call_args_list
+            if not call[0]
+        ]
+        self.assertEqual(1, len(acquired))
+
+    def test_rolled_back_savepoint(self):
+        OnCommitCopyFooService.execute({"foo": self.foo, "one": "b"})
+        try:
+            with transaction.atomic():
+                OnCommitCopyFooService.execute({"foo": self.foo, "one": "c"})
+                raise ValueError
+        except ValueError:
+            pass
+        OnCommitCopyFooService.execute({"foo": self.foo, "one": "d"})
+
+        self.run_commit_hooks()
+        self.assertEqual(["a", "b", "d"], self.ones())
+
+    def test_publisher_survives_savepoint_rollback(self):
+        try:
+            with transaction.atomic():
+                OnCommitCopyFooService.execute({"foo": self.foo, "one": "b"})
+                with transaction.atomic():
+                    OnCommitCopyFooService.execute(
+                        {"foo": self.foo, "one": "c"})
+                raise ValueError
+        except ValueError:
+            pass
+        OnCommitCopyFooService.execute({"foo": self.foo, "one": "d"})
+
+        self.run_commit_hooks()
+        self.assertEqual(["a", "d"], self.ones())
+
+    def test_single_publisher_last(self):
+        other = Mock()
+        for one in "bcd":
+            OnCommitCopyFooService.execute({"foo": self.foo, "one": one})
+            transaction.on_commit(other)
+
+        OnCommitCopyFooService.execute({"foo": self.foo, "one": "e"})
+
+        hooks = [hook[1] for hook in connection.run_on_commit[self.hooks:]]
+        self.assertIsInstance(hooks[-1], OnCommitPublisher)
+        self.assertEqual(1, len([
+            hook for hook in hooks if isinstance(hook, OnCommitPublisher)
+        ]))
+        self.assertEqual(4, len(hooks[-1].queued))
+        self.run_commit_hooks()
+        self.assertEqual(["a", "b", "c", "d", "e"], self.ones())
+        self.assertEqual(3, other.call_count)
+
+    def test_execute_many(self):
+        result = OnCommitCopyFooService.execute_many(
+            [{"foo": self.foo, "one": "b"}, {"foo": self.foo, "one": "c"}],
+            batch_size=1,
+        )
+
+        self.assertEqual(2, len(result.results))
+        self.assertEqual(["a"], self.ones())
+        self.run_commit_hooks()
+        self.assertEqual(["a", "b", "c"], self.ones())
+
+
+class TaskOptionsTest(TestCase):
+    def setUp(self):
+        self.foo = FooModel.objects.create(one="a")
+
+        app = celery_service_task.app
+        eager = app.conf.task_always_eager
+        app.conf.task_always_eager = True
+        self.addCleanup(setattr, app.conf, "task_always_eager", eager)
+
+    def test_registered_task(self):
+        task = celery_service_task.app.tasks[
+            "tests.services.QueuedCopyFooService"]
+
+        self.assertEqual("copy", task.queue)
+        self.assertEqual("10/s", task.rate_limit)
+        self.assertTrue(task.acks_late)
+        self.assertIsNone(CopyFooService._task)
+
+    def test_subclass_task(self):
+        self.assertEqual("tests.services.QueuedJSONCopyFooService",
+                         QueuedJSONCopyFooService._task.name)
+        self.assertEqual("copy", QueuedJSONCopyFooService._task.queue)
+
+    def test_signature(self):
+        signature = QueuedCopyFooService._task_signature({"one": "b"})
+
+        self.assertEqual("tests.services.QueuedCopyFooService",
+                         signature.task)
+        self.assertEqual(((), {}), (signature.args[1:], signature.kwargs))
+
+    def test_execute(self):
+        QueuedCopyFooService.execute({"foo": self.foo, "one": "b"})
+        QueuedJSONCopyFooService.execute({"foo": self.foo, "one": "c"})
+
+        self.assertEqual(3, FooModel.objects.count())
+
+    def test_execute_many(self):
+        QueuedJSONCopyFooService.execute_many(
+            [{"foo": self.foo, "one": "b"}, {"foo": self.foo, "one": "c"}],
+            batch_size=1,
+        )
+
+        self.assertEqual(3, FooModel.objects.count())
+
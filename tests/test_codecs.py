@@ -0,0 +1,104 @@
+import datetime
+import decimal
+import json
+import uuid
+
+from django.test import TestCase
+
+from service_objects.codecs import (JSONCodec, PickleCodec, get_codec,
+                                    register_codec)
+from tests.models import CustomFooModel, FooModel
+
+
+class JSONCodecTest(TestCase):
+
+    def roundtrip(self, cleaned_data):
+        codec = JSONCodec()
+        payload = json.loads(json.dumps(codec.encode('key', cleaned_data)))
+        return codec.decode(payload)
+
+    def test_roundtrip(self):
+        cleaned_data = {
+            'none': None,
+            'bool': True,
+            'int': 1,
+            'float': 1.5,
+            'text': 'text',
+            'foo': (FooModel, 1),
+            'foos': (FooModel, [1, 2]),
+            'custom_foo': (CustomFooModel, 'custom'),
+            'datetime': datetime.datetime(
+                2020, 1, 2, 3, 4, 5, 6, tzinfo=datetime.timezone.utc),
+            'date': datetime.date(2020, 1, 2),
+            'time': datetime.time(3, 4, 5),
+            'timedelta': datetime.timedelta(days=1, seconds=2),
+            'decimal': decimal.Decimal('1.50'),
+            'uuid': uuid.uuid4(),
+            'tuple': (1, 'a'),
+            'set': {1, 2},
+            'list': [datetime.date(2020, 1, 2), {'a': decimal.Decimal(1)}],
+            'dict': {'$m': 'not a model', 'nested': {'$d': 'not a date'}},
+        }
+
+        self.assertEqual(('key', cleaned_data), self.roundtrip(cleaned_data))
+
+    def test_compact(self):
+        codec = JSONCodec()
+
+        self.assertEqual(
+            ['key', {'foo': {'$m': ['tests.foomodel', 1]}, 'a': 1}],
+            codec.encode('key', {'foo': (FooModel, 1), 'a': 1}))
+
+    def test_packed_lists(self):
+        codec = JSONCodec()
+        dates = [datetime.date(2020, 1, 1), datetime.date(2020, 1, 2)]
+        rows = [{'n': 1, 'date': dates[0]}, {'n': 2, 'date': dates[1]}]
+
+        self.assertEqual({'$d': ['2020-01-01', '2020-01-02']},
+                         codec.encode_value(dates))
+        self.assertEqual({'$ir': [[1, 4], 7, [9, 12]]},
+                         codec.encode_value([1, 2, 3, 4, 7, 9, 10, 11, 12]))
+        self.assertEqual([1, 3, 5], codec.encode_value([1, 3, 5]))
+        self.assertEqual(
+            {'$rows': [['n', 'date'], [1, 2],
+                       {'$d': ['2020-01-01', '2020-01-02']}]},
+            codec.encode_value(rows))
+
+        cleaned_data = {
+            'dates': dates,
+            'decimals': [decimal.Decimal('1.5'), decimal.Decimal(2)],
+            'ints': [5, 6, 7, 8, 1, 2],
+            'foos': (FooModel, list(range(1, 101))),
+            'rows': rows,
+            'nested_rows': [{'rows': rows, '$key': None}] * 2,
+            'mixed_rows': [{'a': 1}, {'b': 2}],
+            'mixed': [1, 'a', datetime.date(2020, 1, 1), True, 2],
+        }
+        self.assertEqual(('key', cleaned_data), self.roundtrip(cleaned_data))
+
+    def test_unsupported_values(self):
+        codec = JSONCodec()
+
+        with self.assertRaises(TypeError):
+            codec.encode('key', {'foo': FooModel(one='a')})
+        with self.assertRaises(TypeError):
+            codec.encode('key', {'foo': {1: 'a'}})
+        with self.assertRaises(TypeError):
+            codec.encode('key', {'foo': [{1: 'a'}, {1: 'b'}]})
+
+
+class CodecRegistryTest(TestCase):
+
+    def test_builtin_codecs(self):
+        self.assertIsInstance(get_codec('json'), JSONCodec)
+        self.assertIsInstance(get_codec('pickle'), PickleCodec)
+
+    def test_register_codec(self):
+        codec = PickleCodec()
+        register_codec('custom', codec)
+
+        self.assertIs(codec, get_codec('custom'))
+
+    def test_unknown_codec(self):
+        with self.assertRaises(ValueError):
+            get_codec('unknown')
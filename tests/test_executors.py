@@ -0,0 +1,138 @@
+import threading
+
+from django.test import SimpleTestCase
+
+from service_objects.executors import PostProcessExecutor, run_synchronously
+
+try:
+    from unittest.mock import Mock
+except ImportError:
+    from mock import Mock
+
+
+def thread_name():
+    return threading.current_thread().name
+
+
+class PostProcessExecutorTest(SimpleTestCase):
+
+    def executor(self, **kwargs):
+        executor = PostProcessExecutor(**kwargs)
+        self.addCleanup(executor.shutdown)
+        return executor
+
+    def test_runs_in_background(self):
+        executor = self.executor()
+        threads = []
+
+        executor.submit(lambda: threads.append(thread_name()))
+
+        self.assertTrue(executor.drain(1))
+        self.assertEqual(1, len(threads))
+        self.assertTrue(threads[0].startswith('post_process'))
+        self.assertEqual(0, executor.pending)
+
+    def test_runs_inline_when_full(self):
+        executor = self.executor(max_workers=1, max_pending=1, timeout=0)
+        release = threading.Event()
+        threads = []
+
+        executor.submit(release.wait)
+        executor.submit(lambda: threads.append(thread_name()))
+        release.set()
+
+        self.assertTrue(executor.drain(1))
+        self.assertEqual([thread_name()], threads)
+
+    def test_waits_for_room(self):
+        executor = self.executor(max_workers=1, max_pending=1, timeout=None)
+        release = threading.Event()
+        threads = []
+
+        executor.submit(release.wait)
+        threading.Timer(0.05, release.set).start()
+        executor.submit(lambda: threads.append(thread_name()))
+
+        self.assertTrue(executor.drain(1))
+        self.assertTrue(threads[0].startswith('post_process'))
+
+    def test_drain_timeout(self):
+        executor = self.executor(max_workers=1)
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        executor.submit(release.wait)
+
+        self.assertFalse(executor.drain(0.01))
+        self.assertEqual(1, executor.pending)
+        release.set()
+        self.assertTrue(executor.drain(1))
+
+    def test_on_error(self):
+        on_error = Mock()
+        executor = self.executor(on_error=on_error)
+        error = ValueError('boom')
+
+        def fail():
+            raise error
+
+        executor.submit(fail)
+
+        self.assertTrue(executor.drain(1))
+        on_error.assert_called_once_with(error)
+
+    def test_logs_errors(self):
+        executor = self.executor()
+
+        def fail():
+            raise ValueError('boom')
+
+        with self.assertLogs('service_objects.executors', 'ERROR') as logs:
+            executor.submit(fail)
+            executor.drain(1)
+
+        self.assertIn('post_process failed', logs.output[0])
+
+    def test_sync(self):
+        executor = self.executor(sync=True)
+        threads = []
+
+        executor.submit(lambda: threads.append(thread_name()))
+
+        self.assertEqual([thread_name()], threads)
+        self.assertIsNone(executor._pool)
+
+    def test_sync_raises(self):
+        executor = self.executor(sync=True)
+
+        def fail():
+            raise ValueError('boom')
+
+        with self.assertRaises(ValueError):
+            executor.submit(fail)
+
+    def test_run_synchronously(self):
+        executor = self.executor()
+        threads = []
+
+        with run_synchronously():
+            executor.submit(lambda: threads.append(thread_name()))
+
+        self.assertEqual([thread_name()], threads)
+
+    def test_shutdown(self):
+        executor = self.executor(max_workers=1)
+        release = threading.Event()
+        done = []
+
+        executor.submit(lambda: release.wait(1) and done.append(1))
+        release.set()
+        executor.shutdown()
+        executor.submit(lambda: done.append(thread_name()))
+
+        self.assertEqual([1, thread_name()], done)
+        self.assertEqual(0, executor.pending)
+
+    def test_max_pending(self):
+        with self.assertRaises(ValueError):
+            PostProcessExecutor(max_pending=0)
@@ -1,10 +1,17 @@
+import copy
 from unittest import TestCase
 
+try:
+    from unittest.mock import patch
+except ImportError:
+    from mock import patch
+
 from django.core.exceptions import ValidationError
+from django.test import TestCase as DatabaseTestCase
 
 from service_objects.fields import MultipleFormField, ModelField, MultipleModelField, \
     DictField, ListField
-from tests.forms import FooForm
+from tests.forms import FooForm, HookedFooForm
 from tests.models import FooModel, BarModel, NonModel
 
 
@@ -74,6 +81,156 @@ class MultipleFormFieldTest(TestCase):
         f.clean([])
 
 
+class MultipleFormFieldBulkTest(TestCase):
+
+    def test_bulk(self):
+        f = MultipleFormField(FooForm, bulk=True)
+
+        with patch.object(FooForm, '__init__') as init:
+            cleaned_data = f.clean([{'name': 'abcde'}, {'name': 'fghij'}])
+
+        self.assertEqual([{'name': 'abcde'}, {'name': 'fghij'}], cleaned_data)
+        init.assert_not_called()
+
+    def test_bulk_matches_forms(self):
+        values = [{'name': 'abc'}, {'name': 'abcdef'}]
+        bulk = MultipleFormField(FooForm, bulk=True, collect_errors=True)
+        forms = MultipleFormField(FooForm, collect_errors=True)
+
+        for items in (values[:1], values):
+            for f in (bulk, forms):
+                try:
+                    result = f.clean(items)
+                except ValidationError as e:
+                    result = e.messages
+                else:
+                    result = [getattr(item, 'cleaned_data', item)
+                              for item in result]
+                if f is bulk:
+                    expected = result
+            self.assertEqual(expected, result)
+
+    def test_bulk_with_hooks(self):
+        f = MultipleFormField(HookedFooForm, bulk=True)
+
+        self.assertEqual([{'name': 'ABC'}], f.clean([{'name': 'abc'}]))
+
+    def test_bulk_item_type(self):
+        f = MultipleFormField(FooForm, bulk=True)
+
+        with self.assertRaisesRegex(ValidationError, 'dictionary'):
+            f.clean(['abc'])
+
+    def test_collect_errors(self):
+        f = MultipleFormField(FooForm, bulk=True, collect_errors=True)
+
+        with self.assertRaises(ValidationError) as cm:
+            f.clean([{'name': ''}, {'name': 'abc'}, {'name': 'abcdef'}])
+
+        messages = cm.exception.messages
+        self.assertEqual(2, len(messages))
+        self.assertTrue(messages[0].startswith('[0]: '))
+        self.assertTrue(messages[1].startswith('[2]: '))
+
+    def test_first_error(self):
+        f = MultipleFormField(FooForm, bulk=True)
+
+        with self.assertRaises(ValidationError) as cm:
+            f.clean([{'name': 'abc'}, {'name': ''}, {'name': 'abcdef'}])
+
+        self.assertEqual(1, len(cm.exception.messages))
+        self.assertIn('[1]', cm.exception.message)
+
+
+class MultipleFormFieldIterableTest(TestCase):
+
+    def rows(self, count, read):
+        for index in range(count):
+            read.append(index)
+            yield {'name': 'n{}'.format(index)}
+
+    def test_generator(self):
+        f = MultipleFormField(FooForm, bulk=True)
+
+        cleaned_data = f.clean(self.rows(3, []))
+
+        self.assertEqual(['n0', 'n1', 'n2'],
+                         [item['name'] for item in cleaned_data])
+
+    def test_max_count_stops_reading(self):
+        f = MultipleFormField(FooForm, max_count=2)
+        read = []
+
+        with self.assertRaises(ValidationError) as cm:
+            f.clean(self.rows(1000, read))
+
+        self.assertEqual(
+            'There needs to be at most 2 items.', cm.exception.message)
+        self.assertEqual([0, 1, 2], read)
+
+    def test_min_count(self):
+        f = MultipleFormField(FooForm, min_count=2)
+
+        with self.assertRaisesRegex(ValidationError, 'at least 2'):
+            f.clean(self.rows(1, []))
+
+    def test_empty_is_required(self):
+        f = MultipleFormField(FooForm)
+
+        with self.assertRaisesRegex(ValidationError, 'required'):
+            f.clean(iter([]))
+
+    def test_empty_is_not_required(self):
+        f = MultipleFormField(FooForm, required=False)
+
+        self.assertEqual([], f.clean(iter([])))
+
+    def test_non_iterable(self):
+        f = MultipleFormField(FooForm)
+
+        with self.assertRaisesRegex(ValidationError, 'iterable'):
+            f.clean(1)
+
+    def test_lazy(self):
+        f = MultipleFormField(FooForm, bulk=True, lazy=True)
+        read = []
+
+        cleaned_data = f.clean(self.rows(3, read))
+
+        self.assertEqual([0], read)
+        self.assertEqual({'name': 'n0'}, next(cleaned_data))
+        self.assertEqual([{'name': 'n1'}, {'name': 'n2'}], list(cleaned_data))
+
+    def test_lazy_invalid_item(self):
+        f = MultipleFormField(FooForm, bulk=True, lazy=True)
+
+        cleaned_data = f.clean([{'name': 'a'}, {'name': ''}])
+
+        self.assertEqual({'name': 'a'}, next(cleaned_data))
+        with self.assertRaisesRegex(ValidationError, r'\[1\]'):
+            next(cleaned_data)
+
+    def test_lazy_max_count(self):
+        f = MultipleFormField(FooForm, max_count=2, lazy=True)
+
+        cleaned_data = f.clean(self.rows(1000, []))
+
+        with self.assertRaisesRegex(ValidationError, 'at most 2'):
+            list(cleaned_data)
+
+    def test_lazy_empty_is_required(self):
+        f = MultipleFormField(FooForm, lazy=True)
+
+        with self.assertRaisesRegex(ValidationError, 'required'):
+            f.clean(iter([]))
+
+    def test_lazy_first_item_validated(self):
+        f = MultipleFormField(FooForm, lazy=True)
+
+        with self.assertRaisesRegex(ValidationError, r'\[0\]'):
+            f.clean(iter([{'name': ''}]))
+
+
 class ModelFieldTest(TestCase):
 
     def test_init_model_class_invalid(self):
@@ -90,6 +247,24 @@ class ModelFieldTest(TestCase):
 
         self.assertEqual(BarModel, rv.model_class)
 
+    def test_model_class_string_resolved_lazily(self):
+        with patch('service_objects.fields.apps.get_model',
+                   return_value=BarModel) as get_model:
+            rv = ModelField('tests.BarModel')
+            get_model.assert_not_called()
+
+            copies = [copy.deepcopy(rv) for _ in range(3)]
+            for field in copies:
+                self.assertEqual(BarModel, field.model_class)
+
+        get_model.assert_called_once_with('tests', 'BarModel')
+
+    def test_model_class_string_unknown(self):
+        rv = ModelField('tests.MissingModel')
+
+        with self.assertRaises(LookupError):
+            rv.clean(BarModel(one='a'))
+
     def test_model_invalid_type(self):
         model_field = ModelField(FooModel)
         model = BarModel(one='Z')
@@ -195,6 +370,113 @@ class MultipleModelFieldTest(TestCase):
         # should not raise any exception
         f.clean(None)
 
+    def test_iterator(self):
+        model_field = MultipleModelField(FooModel)
+        objects = [FooModel(one='a'), FooModel(one='b')]
+        for obj in objects:
+            obj.pk = 1
+
+        cleaned_data = model_field.clean(obj for obj in objects)
+
+        self.assertEqual(objects, cleaned_data)
+
+    def test_iterator_invalid_type(self):
+        model_field = MultipleModelField(FooModel, allow_unsaved=True)
+
+        with self.assertRaisesRegex(ValidationError, "FooModel"):
+            model_field.clean(iter([FooModel(one='a'), BarModel(one='b')]))
+
+    def test_empty_iterator_is_required(self):
+        model_field = MultipleModelField(FooModel)
+
+        with self.assertRaisesRegex(ValidationError, "required"):
+            model_field.clean(iter([]))
+
+
+class ModelFieldPkTest(DatabaseTestCase):
+    def setUp(self):
+        self.foo = FooModel.objects.create(one='a')
+        FooModel.objects.create(one='b')
+
+    def test_pk(self):
+        model_field = ModelField(FooModel, accept_pk=True)
+
+        self.assertEqual(self.foo, model_field.clean(self.foo.pk))
+
+    def test_pk_not_accepted(self):
+        model_field = ModelField(FooModel)
+
+        with self.assertRaisesRegex(ValidationError, "FooModel"):
+            model_field.clean(self.foo.pk)
+
+    def test_queryset(self):
+        model_field = ModelField(
+            FooModel, accept_pk=True, queryset=FooModel.objects.filter(one='b'))
+
+        with self.assertRaisesRegex(ValidationError, "No foo model"):
+            model_field.clean(self.foo.pk)
+
+    def test_select_related(self):
+        model_field = MultipleModelField(
+            FooModel, accept_pk=True, select_related=['owner'])
+
+        with patch('django.db.models.query.QuerySet.select_related') as sr:
+            sr.return_value.in_bulk.return_value = {self.foo.pk: self.foo}
+            self.assertEqual([self.foo], model_field.clean([self.foo.pk]))
+
+        sr.assert_called_once_with('owner')
+
+
+class MultipleModelFieldQuerySetTest(DatabaseTestCase):
+    def setUp(self):
+        FooModel.objects.create(one='a')
+        FooModel.objects.create(one='b')
+
+    def test_queryset_not_evaluated(self):
+        model_field = MultipleModelField(FooModel)
+        queryset = FooModel.objects.all()
+
+        with self.assertNumQueries(1):
+            cleaned_data = model_field.clean(queryset)
+
+        self.assertIs(queryset, cleaned_data)
+        self.assertIsNone(cleaned_data._result_cache)
+
+    def test_manager(self):
+        model_field = MultipleModelField(FooModel, required=False)
+
+        with self.assertNumQueries(0):
+            cleaned_data = model_field.clean(FooModel.objects)
+
+        self.assertEqual(2, len(cleaned_data))
+
+    def test_queryset_invalid_type(self):
+        model_field = MultipleModelField(FooModel)
+
+        with self.assertNumQueries(0):
+            with self.assertRaisesRegex(ValidationError, "FooModel"):
+                model_field.clean(BarModel.objects.all())
+
+    def test_values_queryset_invalid_type(self):
+        model_field = MultipleModelField(FooModel)
+
+        with self.assertRaisesRegex(ValidationError, "FooModel"):
+            model_field.clean(FooModel.objects.values('one'))
+        with self.assertRaisesRegex(ValidationError, "FooModel"):
+            model_field.clean(FooModel.objects.values_list('pk', flat=True))
+
+    def test_empty_queryset_is_required(self):
+        model_field = MultipleModelField(FooModel)
+
+        with self.assertRaisesRegex(ValidationError, "required"):
+            model_field.clean(FooModel.objects.filter(one='c'))
+
+    def test_empty_queryset_is_not_required(self):
+        model_field = MultipleModelField(FooModel, required=False)
+        queryset = FooModel.objects.none()
+
+        self.assertIs(queryset, model_field.clean(queryset))
+
 
 class DictFieldTest(TestCase):
     def test_is_required(self):
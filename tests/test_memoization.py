@@ -0,0 +1,190 @@
+try:
+    from unittest.mock import patch
+except ImportError:
+    from mock import patch
+
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase
+
+from service_objects.memoization import (LRUBackend, Memoize, MemoizeStats,
+                                         freeze)
+from service_objects.signals import service_phase_timed
+
+from tests.models import FooModel
+from tests.services import (DjangoMemoizedFooService, MemoizedFooService,
+                            UnsavedMemoizedFooService)
+
+
+class FreezeTest(TestCase):
+    def test_models(self):
+        foo = FooModel.objects.create(one="a")
+
+        self.assertEqual(("tests.foomodel", foo.pk), freeze(foo))
+
+    def test_querysets_not_evaluated(self):
+        queryset = FooModel.objects.filter(one="a")
+
+        with self.assertNumQueries(0):
+            key = freeze(queryset)
+
+        self.assertEqual(key, freeze(FooModel.objects.filter(one="a")))
+        self.assertNotEqual(key, freeze(FooModel.objects.filter(one="b")))
+        self.assertEqual(("queryset", "tests.foomodel", None),
+                         freeze(FooModel.objects.none()))
+
+    def test_containers(self):
+        self.assertEqual(freeze({"a": [1, 2], "b": {3}}),
+                         freeze({"b": {3}, "a": (1, 2)}))
+        self.assertNotEqual(freeze({"a": 1}), freeze([("a", 1)]))
+
+    def test_unhashable(self):
+        with self.assertRaises(TypeError):
+            freeze(bytearray())
+
+    def test_unsaved_models(self):
+        with self.assertRaises(TypeError):
+            freeze(FooModel(one="a"))
+
+
+class LRUBackendTest(TestCase):
+    def test_evicts_least_recently_used(self):
+        backend = LRUBackend(max_entries=2)
+        backend.set(("s", 1), "one", None)
+        backend.set(("s", 2), "two", None)
+        backend.get(("s", 1))
+        backend.set(("s", 3), "three", None)
+
+        self.assertEqual((True, "one"), backend.get(("s", 1)))
+        self.assertEqual((False, None), backend.get(("s", 2)))
+        self.assertEqual(2, backend.size())
+
+    def test_ttl(self):
+        backend = LRUBackend()
+        with patch("service_objects.memoization.monotonic", return_value=0):
+            backend.set(("s", 1), "one", 10)
+        with patch("service_objects.memoization.monotonic", return_value=9):
+            self.assertEqual((True, "one"), backend.get(("s", 1)))
+        with patch("service_objects.memoization.monotonic", return_value=10):
+            self.assertEqual((False, None), backend.get(("s", 1)))
+
+
+class MemoizeTest(TransactionTestCase):
+    service_class = MemoizedFooService
+
+    def setUp(self):
+        self.foo = FooModel.objects.create(one="a")
+        self.service_class.calls = 0
+        self.service_class.invalidate_memoized()
+        self.service_class.memoize.reset_stats()
+
+    def execute(self, number=2):
+        return self.service_class.execute({"foo": self.foo,
+                                           "number": number})
+
+    def test_hit(self):
+        self.assertEqual(["a", "a"], self.execute())
+        self.assertEqual(["a", "a"], self.execute())
+
+        self.assertEqual(1, self.service_class.calls)
+        stats = self.service_class.memoize.stats()
+        self.assertEqual(MemoizeStats(1, 1, stats.size), stats)
+
+    def test_hit_with_timings(self):
+        phases = []
+
+        def receiver(phase, **kwargs):
+            phases.append(phase)
+
+        service_phase_timed.connect(receiver)
+        self.addCleanup(service_phase_timed.disconnect, receiver)
+        self.execute()
+        self.execute()
+
+        self.assertEqual(1, self.service_class.calls)
+        self.assertEqual(1, phases.count("process"))
+
+    def test_outer_rollback_not_cached(self):
+        try:
+            with transaction.atomic():
+                self.execute()
+                raise ValueError
+        except ValueError:
+            pass
+        self.execute()
+
+        self.assertEqual(2, self.service_class.calls)
+
+    def test_cached_on_outer_commit(self):
+        with transaction.atomic():
+            self.execute()
+            self.execute()
+        self.execute()
+
+        self.assertEqual(2, self.service_class.calls)
+
+    def test_unsaved_models_not_cached(self):
+        service_class = UnsavedMemoizedFooService
+
+        self.assertEqual("a", service_class.execute({"foo": FooModel(one="a")}))
+        self.assertEqual("b", service_class.execute({"foo": FooModel(one="b")}))
+        self.assertEqual((0, 0), service_class.memoize.stats()[:2])
+
+    def test_different_inputs(self):
+        self.execute(1)
+        self.execute(2)
+
+        self.assertEqual(2, self.service_class.calls)
+
+    def test_invalidate(self):
+        self.execute()
+        self.service_class.invalidate_memoized(
+            {"foo": self.foo, "number": 2})
+        self.execute()
+
+        self.assertEqual(2, self.service_class.calls)
+
+    def test_invalidate_all(self):
+        self.execute(1)
+        self.execute(2)
+        self.service_class.invalidate_memoized()
+        self.execute(1)
+        self.execute(2)
+
+        self.assertEqual(4, self.service_class.calls)
+
+    def test_invalid_inputs_not_cached(self):
+        with self.assertRaises(Exception):
+            self.execute("x")
+        self.assertEqual((0, 0), self.service_class.memoize.stats()[:2])
+
+    def test_key_function(self):
+        memoize = Memoize(key=lambda cleaned_data: cleaned_data["number"])
+
+        with patch.object(self.service_class, "memoize", memoize):
+            self.execute()
+            self.foo.one = "b"
+            self.foo.save()
+            self.assertEqual(["a", "a"], self.execute())
+
+    def test_uncachable_key(self):
+        memoize = Memoize(key=lambda cleaned_data: None)
+
+        with patch.object(self.service_class, "memoize", memoize):
+            self.execute()
+            self.execute()
+
+        self.assertEqual(2, self.service_class.calls)
+        self.assertEqual((0, 0), memoize.stats()[:2])
+
+
+class DjangoMemoizeTest(MemoizeTest):
+    service_class = DjangoMemoizedFooService
+
+    def test_uses_cache(self):
+        self.execute()
+        cache.clear()
+        self.execute()
+
+        self.assertEqual(2, self.service_class.calls)
+        self.assertIsNone(self.service_class.memoize.stats().size)
@@ -0,0 +1,83 @@
+from django.db import DatabaseError, OperationalError
+from django.test import SimpleTestCase
+
+from service_objects.retry import backoff, is_retryable
+
+try:
+    from unittest.mock import Mock, patch
+except ImportError:
+    from mock import Mock, patch
+
+
+def vendor(name):
+    return Mock(vendor=name)
+
+
+def caused_by(error, **attrs):
+    cause = Exception()
+    for name, value in attrs.items():
+        setattr(cause, name, value)
+    error.__cause__ = cause
+    return error
+
+
+class IsRetryableTest(SimpleTestCase):
+
+    def test_postgresql(self):
+        postgresql = vendor('postgresql')
+
+        self.assertTrue(is_retryable(
+            caused_by(OperationalError(), pgcode='40001'), postgresql))
+        self.assertTrue(is_retryable(
+            caused_by(OperationalError(), sqlstate='40P01'), postgresql))
+        self.assertFalse(is_retryable(
+            caused_by(OperationalError(), pgcode='23505'), postgresql))
+        self.assertFalse(is_retryable(OperationalError(), postgresql))
+
+    def test_mysql(self):
+        mysql = vendor('mysql')
+
+        self.assertTrue(is_retryable(
+            OperationalError(1213, 'Deadlock found'), mysql))
+        self.assertTrue(is_retryable(
+            OperationalError(1205, 'Lock wait timeout exceeded'), mysql))
+        self.assertFalse(is_retryable(
+            OperationalError(2006, 'MySQL server has gone away'), mysql))
+
+    def test_sqlite(self):
+        sqlite = vendor('sqlite')
+
+        self.assertTrue(is_retryable(
+            OperationalError('database is locked'), sqlite))
+        self.assertFalse(is_retryable(
+            OperationalError('no such table: foo'), sqlite))
+
+    def test_oracle(self):
+        oracle = vendor('oracle')
+
+        self.assertTrue(is_retryable(DatabaseError(
+            'ORA-00060: deadlock detected while waiting for resource'),
+            oracle))
+        self.assertTrue(is_retryable(DatabaseError(
+            'ORA-08177: can\'t serialize access for this transaction'),
+            oracle))
+        self.assertFalse(is_retryable(DatabaseError('ORA-00001'), oracle))
+
+    def test_other_errors(self):
+        self.assertFalse(is_retryable(
+            ValueError('database is locked'), vendor('sqlite')))
+        self.assertFalse(is_retryable(
+            OperationalError('database is locked'), vendor('unknown')))
+
+
+class BackoffTest(SimpleTestCase):
+
+    def test_exponential(self):
+        with patch('random.uniform', side_effect=lambda a, b: b):
+            delays = [backoff(attempt, 0.1, 1.0) for attempt in range(1, 6)]
+
+        self.assertEqual([0.1, 0.2, 0.4, 0.8, 1.0], delays)
+
+    def test_jitter(self):
+        for attempt in range(1, 10):
+            self.assertTrue(0 <= backoff(attempt, 0.1, 0.5) <= 0.5)
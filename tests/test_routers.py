@@ -0,0 +1,62 @@
+try:
+    from unittest.mock import patch
+except ImportError:
+    from mock import patch
+
+from django.db import connections
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from service_objects.routers import StickyPrimaryMiddleware
+
+from tests.models import FooModel
+from tests.services import (CreateFooService, ReadFooService,
+                            RoutedReadFooService)
+
+
+@override_settings(DATABASE_ROUTERS=['service_objects.routers.ServiceRouter'])
+class ReadOnlyServiceTest(TestCase):
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        FooModel.objects.create(one='a')
+        FooModel.objects.using('replica').create(one='r')
+
+    def test_reads_from_replica(self):
+        with CaptureQueriesContext(connections['default']) as primary, \
+                CaptureQueriesContext(connections['replica']) as replica:
+            self.assertEqual(['r'], ReadFooService.execute({'one': 'r'}))
+
+        self.assertEqual(0, len(primary.captured_queries))
+        self.assertEqual(1, len(replica.captured_queries))
+
+    def test_routers_choose(self):
+        with CaptureQueriesContext(connections['default']) as primary:
+            self.assertEqual(['a'], RoutedReadFooService.execute(
+                {'one': 'a'}))
+
+        # No SAVEPOINT, only the SELECT.
+        self.assertEqual(1, len(primary.captured_queries))
+
+    def test_post_process(self):
+        with patch.object(ReadFooService, 'post_process') as post_process:
+            ReadFooService.execute({'one': 'r'})
+
+        post_process.assert_called_once_with()
+
+    def test_sticky_primary(self):
+        def view(request):
+            before = ReadFooService.execute({'one': 'b'})
+            CreateFooService.execute({'one': 'b'})
+            return before, ReadFooService.execute({'one': 'b'})
+
+        before, after = StickyPrimaryMiddleware(view)(None)
+
+        self.assertEqual([], before)
+        self.assertEqual(['b'], after)
+        self.assertEqual([], ReadFooService.execute({'one': 'b'}))
+
+    def test_not_sticky_without_middleware(self):
+        CreateFooService.execute({'one': 'b'})
+
+        self.assertEqual([], ReadFooService.execute({'one': 'b'}))
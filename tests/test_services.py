@@ -1,15 +1,29 @@
 import pickle
+import threading
 import datetime
 
 import six
+from asgiref.sync import async_to_sync
 from django import forms
-from django.test import TestCase
+from django.core.exceptions import ImproperlyConfigured
+from django.db import OperationalError, connection, transaction
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
 
 from service_objects.errors import InvalidInputsError
-from service_objects.services import ModelService
-from tests.models import CustomFooModel, FooModel
+from service_objects.executors import run_synchronously
+from service_objects.services import (ModelService, FieldsView, Service,
+                                      PhaseTimer)
+from service_objects.routers import _read_database
+from service_objects.signals import service_phase_timed, service_retried
+from tests.models import BarModel, CustomFooModel, FooModel
 from tests.services import (FooService, MockService, NoDbTransactionService,
-                            FooModelService)
+                            FooModelService, CreateFooService,
+                            SharedFieldsService, LightFooService,
+                            LightPkFooService, PkFooService,
+                            LazyModelFieldService, CompositeFooService,
+                            JoinedCreateFooService, RetryFooService,
+                            BackgroundFooService, RetryUpdateFooService)
 
 try:
     from unittest.mock import Mock, patch
@@ -67,6 +81,672 @@ class ServiceTest(TestCase):
         assert mock_transaction.on_commit.called_once_with(MockService.post_process)
 
 
+class ExecuteManyTest(TestCase):
+
+    def test_results_in_input_order(self):
+        results = list(CreateFooService.execute_many(
+            [{'one': 'a'}, {'one': 'toolong'}, {'one': 'c'}], batch_size=2))
+
+        self.assertEqual([0, 1, 2], [r.index for r in results])
+        self.assertEqual('a', results[0].result.one)
+        self.assertIsNone(results[0].error)
+        self.assertIsNone(results[1].result)
+        self.assertIn('one', results[1].error.errors)
+        self.assertEqual('c', results[2].result.one)
+        self.assertEqual(2, FooModel.objects.count())
+
+    def test_on_error_raise(self):
+        results = CreateFooService.execute_many(
+            [{'one': 'a'}, {}], on_error='raise')
+
+        with self.assertRaises(InvalidInputsError):
+            list(results)
+        self.assertEqual(0, FooModel.objects.count())
+
+    def test_is_lazy(self):
+        def inputs():
+            for one in 'abcde':
+                yield {'one': one}
+
+        results = CreateFooService.execute_many(inputs(), batch_size=2)
+        self.assertEqual(0, FooModel.objects.count())
+
+        next(results)
+        self.assertEqual(2, FooModel.objects.count())
+
+    def test_one_transaction_per_batch(self):
+        inputs = [{'one': str(i)} for i in range(5)]
+
+        with patch('django.db.transaction.atomic',
+                   wraps=transaction.atomic) as atomic:
+            list(CreateFooService.execute_many(inputs, batch_size=2))
+
+        self.assertEqual(3, atomic.call_count)
+
+    def test_post_process_called_for_each_item(self):
+        calls = []
+
+        def post_process(_self):
+            calls.append(_self.cleaned_data['one'])
+
+        with patch.object(CreateFooService, 'post_process', post_process), \
+                patch('django.db.transaction.on_commit') as on_commit:
+            list(CreateFooService.execute_many(
+                [{'one': 'a'}, {'one': 'b'}]))
+            self.assertEqual([], calls)
+
+            self.assertEqual(1, on_commit.call_count)
+            on_commit.call_args[0][0]()
+
+        self.assertEqual(['a', 'b'], calls)
+
+    def test_process_batch_result_count(self):
+        def process_batch(cls, instances):
+            return [instance.process() for instance in instances[1:]]
+
+        with patch.object(CreateFooService, 'process_batch',
+                          classmethod(process_batch)):
+            with self.assertRaisesRegex(ValueError, '1 results for 2'):
+                list(CreateFooService.execute_many(
+                    [{'one': 'a'}, {'one': 'b'}]))
+
+        self.assertEqual(0, FooModel.objects.count())
+
+    def test_invalid_on_error(self):
+        with self.assertRaises(ValueError):
+            list(CreateFooService.execute_many([], on_error='ignore'))
+
+
+class SharedFieldsTest(TestCase):
+
+    def test_fields_are_shared(self):
+        first = SharedFieldsService()
+        second = SharedFieldsService()
+
+        self.assertIsInstance(first.fields, FieldsView)
+        self.assertTrue(first.fields.is_shared)
+        self.assertIs(first.fields['bar'], second.fields['bar'])
+        self.assertIs(SharedFieldsService.base_fields['bar'],
+                      first.fields['bar'])
+        self.assertEqual(['foo', 'bar', 'items'], list(first.fields))
+
+    def test_execute(self):
+        foo = FooModel.objects.create(one='a')
+
+        cleaned_data = SharedFieldsService.execute({'foo': foo, 'bar': 'b'})
+
+        self.assertEqual({'foo': foo, 'bar': 'b', 'items': []}, cleaned_data)
+        with self.assertRaises(InvalidInputsError):
+            SharedFieldsService.execute({'foo': foo, 'bar': 'toolong'})
+
+    def test_mutable_copies_field(self):
+        service = SharedFieldsService()
+        field = service.fields.mutable('bar')
+        field.required = False
+
+        self.assertIsNot(field, SharedFieldsService.base_fields['bar'])
+        self.assertTrue(SharedFieldsService.base_fields['bar'].required)
+        self.assertFalse(service.fields.is_shared)
+        self.assertIs(field, service.fields.mutable('bar'))
+        self.assertTrue(SharedFieldsService().fields['bar'].required)
+
+    def test_assignment_copies_mapping(self):
+        service = SharedFieldsService()
+        service.fields['baz'] = forms.CharField()
+        del service.fields['items']
+
+        self.assertEqual(['foo', 'bar', 'baz'], list(service.fields))
+        self.assertEqual(['foo', 'bar', 'items'],
+                         list(SharedFieldsService().fields))
+
+    def test_not_shared_by_default(self):
+        service = MockService()
+
+        self.assertIsInstance(service.fields, dict)
+        self.assertIsNot(MockService.base_fields['bar'],
+                         service.fields['bar'])
+
+
+class LightServiceTest(TestCase):
+
+    def test_execute(self):
+        foo = LightFooService.execute({'one': 'a', 'two': '2'})
+
+        self.assertEqual('A', foo.one)
+        self.assertEqual(1, FooModel.objects.count())
+
+    def test_slots(self):
+        service = LightFooService({'one': 'a'})
+
+        self.assertFalse(hasattr(service, '__dict__'))
+        with self.assertRaises(AttributeError):
+            service.bar = 1
+
+    def test_slots_without_declaration(self):
+        service = LightPkFooService({})
+
+        self.assertEqual((), LightPkFooService.__slots__)
+        self.assertFalse(hasattr(service, '__dict__'))
+
+    def test_field_errors(self):
+        with self.assertRaises(InvalidInputsError) as cm:
+            LightFooService.execute({'one': 'ab', 'two': 'x'})
+
+        self.assertEqual(['one', 'two'], list(cm.exception.errors))
+        self.assertEqual(
+            ['Ensure this value has at most 1 character (it has 2).'],
+            cm.exception.errors['one'])
+        self.assertEqual(0, FooModel.objects.count())
+
+    def test_non_field_errors(self):
+        with self.assertRaises(InvalidInputsError) as cm:
+            LightFooService.execute({'one': 'a', 'two': 0})
+
+        self.assertEqual(['Zero is not allowed.'],
+                         cm.exception.non_field_errors)
+        self.assertIn('nonfield', cm.exception.non_field_errors.error_class)
+
+    def test_same_errors_as_service(self):
+        class FooService(MockService):
+            one = forms.CharField(max_length=1)
+            two = forms.IntegerField(required=False)
+
+        inputs = {'one': 'ab', 'two': 'x'}
+        with self.assertRaises(InvalidInputsError) as light:
+            LightFooService.execute(inputs)
+        with self.assertRaises(InvalidInputsError) as regular:
+            FooService.execute(inputs)
+
+        self.assertEqual(regular.exception.errors['one'],
+                         light.exception.errors['one'])
+        self.assertEqual(regular.exception.errors['two'],
+                         light.exception.errors['two'])
+
+    @patch('service_objects.services.transaction')
+    def test_db_transaction(self, mock_transaction):
+        LightFooService.execute({'one': 'a'})
+
+        mock_transaction.atomic.assert_called_once_with(using='default')
+        mock_transaction.on_commit.assert_called_once()
+
+    def test_execute_many(self):
+        results = list(LightFooService.execute_many([{'one': 'a'}, {}]))
+
+        self.assertEqual('A', results[0].result.one)
+        self.assertIn('one', results[1].error.errors)
+
+
+class ResolvePksTest(TestCase):
+    def setUp(self):
+        self.foos = [FooModel.objects.create(one=one) for one in 'abc']
+        self.custom_foo = CustomFooModel.objects.create(
+            custom_pk='custom', one='d')
+
+    def test_one_query_per_model(self):
+        a, b, c = self.foos
+
+        # One query per model, plus the savepoint of the transaction.
+        with self.assertNumQueries(4):
+            cleaned_data = PkFooService.execute({
+                'foo': a.pk,
+                'other_foo': str(b.pk),
+                'foos': [c.pk, a, b.pk],
+                'custom_foo': 'custom',
+            })
+
+        self.assertEqual(a, cleaned_data['foo'])
+        self.assertEqual(b, cleaned_data['other_foo'])
+        self.assertEqual([c, a, b], cleaned_data['foos'])
+        self.assertEqual(self.custom_foo, cleaned_data['custom_foo'])
+
+    def test_instances_not_fetched(self):
+        with self.assertNumQueries(2):
+            cleaned_data = PkFooService.execute({'foo': self.foos[0]})
+
+        self.assertIs(self.foos[0], cleaned_data['foo'])
+
+    def test_missing_pks(self):
+        with self.assertRaises(InvalidInputsError) as cm:
+            PkFooService.execute({
+                'foo': 0,
+                'foos': [self.foos[0].pk, -1, -2],
+                'custom_foo': 'missing',
+            })
+
+        errors = cm.exception.errors
+        self.assertEqual(['No foo model matches the primary key(s) 0.'],
+                         errors['foo'])
+        self.assertEqual(['No foo model matches the primary key(s) -1, -2.'],
+                         errors['foos'])
+        self.assertIn('custom_foo', errors)
+
+    def test_invalid_pk(self):
+        with self.assertRaises(InvalidInputsError) as cm:
+            PkFooService.execute({'foo': 'abc'})
+
+        self.assertIn('foo', cm.exception.errors)
+
+    def test_light_service(self):
+        a, b, c = self.foos
+
+        with self.assertNumQueries(3):
+            cleaned_data = LightPkFooService.execute({
+                'foo': a.pk, 'foos': [b.pk, c.pk]})
+
+        self.assertEqual(a, cleaned_data['foo'])
+        self.assertEqual([b, c], cleaned_data['foos'])
+
+
+class PrewarmTest(TestCase):
+    def test_prewarm(self):
+        fields = (LazyModelFieldService.base_fields['foo'],
+                  LazyModelFieldService.base_fields['people']
+                  .form_class.base_fields['bar'])
+        for field in fields:
+            field.model_class = field._model.label or field._model.model
+
+        with patch('service_objects.fields.apps.get_model',
+                   side_effect=[FooModel, BarModel]) as get_model:
+            LazyModelFieldService.prewarm()
+            self.assertEqual(2, get_model.call_count)
+
+            foo = FooModel.objects.create(one='a')
+            self.assertEqual(foo, LazyModelFieldService.execute({'foo': foo}))
+            self.assertEqual(2, get_model.call_count)
+
+
+class SavepointTest(TestCase):
+    def savepoints(self, service_class, inputs):
+        with CaptureQueriesContext(connection) as queries:
+            service_class.execute(inputs)
+        return len([
+            query for query in queries.captured_queries
+            if query['sql'].startswith('SAVEPOINT')
+        ])
+
+    def test_nested_savepoints(self):
+        self.assertEqual(4, self.savepoints(CompositeFooService, {
+            'count': 3}))
+        self.assertEqual(3, FooModel.objects.count())
+
+    def test_joined_class(self):
+        # Only the outer service's savepoint, as TestCase opened the
+        # transaction.
+        self.assertEqual(1, self.savepoints(CompositeFooService, {
+            'count': 3, 'joined': True}))
+        self.assertEqual(3, FooModel.objects.count())
+
+    def test_joined_call(self):
+        self.assertEqual(1, self.savepoints(CompositeFooService, {
+            'count': 3, 'inner_savepoint': False}))
+
+    def test_savepoint_call(self):
+        self.assertEqual(4, self.savepoints(CompositeFooService, {
+            'count': 3, 'joined': True, 'inner_savepoint': True}))
+
+    def test_outside_service(self):
+        self.assertEqual(1, self.savepoints(JoinedCreateFooService, {
+            'one': 'a'}))
+
+    def test_post_process_on_commit(self):
+        hooks = len(connection.run_on_commit)
+        with patch.object(JoinedCreateFooService, 'post_process') as post:
+            CompositeFooService.execute({'count': 2, 'joined': True})
+
+        post.assert_not_called()
+        callbacks = connection.run_on_commit[hooks:]
+        del connection.run_on_commit[hooks:]
+        self.assertEqual(3, len(callbacks))
+        for callback in callbacks:
+            callback[1]()
+        self.assertEqual(2, post.call_count)
+
+
+class RetryTest(TransactionTestCase):
+
+    def setUp(self):
+        self.retries = []
+        service_retried.connect(self.receiver)
+        self.addCleanup(service_retried.disconnect, self.receiver)
+        sleep = patch('service_objects.services.sleep')
+        self.sleep = sleep.start()
+        self.addCleanup(sleep.stop)
+
+    def receiver(self, sender, attempt, delay, using, exception, **kwargs):
+        self.assertLessEqual(delay, sender.retry_max_backoff)
+        self.retries.append((sender, attempt, using, str(exception)))
+
+    def test_retries_until_commit(self):
+        with patch.object(RetryFooService, 'post_process') as post:
+            foo = RetryFooService.execute({'one': 'a', 'failures': 2})
+
+        self.assertEqual([foo], list(FooModel.objects.all()))
+        post.assert_called_once_with()
+        self.assertEqual([
+            (RetryFooService, 1, 'default', 'database is locked'),
+            (RetryFooService, 2, 'default', 'database is locked'),
+        ], self.retries)
+        self.assertEqual(2, self.sleep.call_count)
+
+    def test_gives_up_after_retry_attempts(self):
+        with patch.object(RetryFooService, 'post_process') as post:
+            with self.assertRaises(OperationalError):
+                RetryFooService.execute({'one': 'a', 'failures': 3})
+
+        self.assertFalse(FooModel.objects.exists())
+        post.assert_not_called()
+        self.assertEqual(2, len(self.retries))
+
+    def test_validates_once(self):
+        with patch.object(RetryFooService, 'service_clean',
+                          autospec=True,
+                          side_effect=RetryFooService.service_clean) as clean:
+            RetryFooService.execute({'one': 'a', 'failures': 1})
+
+        self.assertEqual(1, clean.call_count)
+        self.assertEqual(1, len(self.retries))
+
+    def test_should_retry(self):
+        with patch.object(RetryFooService, 'should_retry',
+                          return_value=False):
+            with self.assertRaises(OperationalError):
+                RetryFooService.execute({'one': 'a', 'failures': 1})
+
+        self.assertEqual([], self.retries)
+
+    def test_not_retried_inside_transaction(self):
+        with self.assertRaises(OperationalError):
+            with transaction.atomic():
+                RetryFooService.execute({'one': 'a', 'failures': 1})
+
+        self.assertEqual([], self.retries)
+        self.sleep.assert_not_called()
+
+    def test_models_reloaded(self):
+        foo = FooModel.objects.create(one='a')
+
+        RetryUpdateFooService.execute({'foo': foo})
+
+        foo.refresh_from_db()
+        self.assertEqual('b', foo.one)
+        self.assertEqual(1, len(self.retries))
+
+    def test_commit_phase_reset(self):
+        events = []
+
+        def receiver(sender, phase, outcome, **kwargs):
+            if phase == 'commit':
+                events.append(outcome)
+
+        service_phase_timed.connect(receiver)
+        self.addCleanup(service_phase_timed.disconnect, receiver)
+        commit = connection.commit
+        commits = []
+
+        def fail_first_commit():
+            commits.append(True)
+            if len(commits) == 1:
+                raise OperationalError('database is locked')
+            return commit()
+
+        process = Mock(side_effect=[
+            None, OperationalError('database is locked'), 'done'])
+        with patch.object(connection, 'commit', fail_first_commit), \
+                patch.object(RetryFooService, 'process', process):
+            self.assertEqual('done', RetryFooService.execute(
+                {'one': 'a', 'failures': 0}))
+
+        self.assertEqual(['error', 'success'], events)
+        self.assertEqual(2, len(self.retries))
+
+    def test_post_process_error_not_retried(self):
+        error = OperationalError('database is locked')
+        with patch.object(RetryFooService, 'post_process',
+                          side_effect=error):
+            with self.assertRaises(OperationalError):
+                RetryFooService.execute({'one': 'a', 'failures': 0})
+
+        self.assertEqual(1, FooModel.objects.count())
+        self.assertEqual([], self.retries)
+
+
+class PostProcessExecutorTest(TestCase):
+
+    def setUp(self):
+        self.executor = BackgroundFooService.post_process_executor
+        self.threads = []
+
+    def record_thread(self):
+        self.threads.append(threading.current_thread().name)
+
+    def run_on_commit(self, hooks):
+        callbacks = connection.run_on_commit[hooks:]
+        del connection.run_on_commit[hooks:]
+        for callback in callbacks:
+            callback[1]()
+
+    def test_post_process_in_background(self):
+        hooks = len(connection.run_on_commit)
+        with patch.object(BackgroundFooService, 'post_process',
+                          side_effect=self.record_thread):
+            self.assertEqual('a', BackgroundFooService.execute({'one': 'a'}))
+            self.assertEqual([], self.threads)
+            self.run_on_commit(hooks)
+            self.assertTrue(self.executor.drain(1))
+
+        self.assertEqual(1, len(self.threads))
+        self.assertTrue(self.threads[0].startswith('post_process'))
+
+    def test_execute_many(self):
+        hooks = len(connection.run_on_commit)
+        with patch.object(BackgroundFooService, 'post_process',
+                          side_effect=self.record_thread):
+            list(BackgroundFooService.execute_many(
+                [{'one': 'a'}, {'one': 'b'}]))
+            self.run_on_commit(hooks)
+            self.assertTrue(self.executor.drain(1))
+
+        self.assertEqual(2, len(self.threads))
+        self.assertTrue(self.threads[0].startswith('post_process'))
+
+    def test_run_synchronously(self):
+        hooks = len(connection.run_on_commit)
+        with patch.object(BackgroundFooService, 'post_process',
+                          side_effect=self.record_thread):
+            with run_synchronously():
+                BackgroundFooService.execute({'one': 'a'})
+                self.run_on_commit(hooks)
+
+        self.assertEqual([threading.current_thread().name], self.threads)
+
+    def test_aexecute(self):
+        with patch.object(BackgroundFooService, 'post_process',
+                          side_effect=self.record_thread):
+            with patch.object(BackgroundFooService, 'db_transaction', False):
+                async_to_sync(BackgroundFooService.aexecute)({'one': 'a'})
+            self.assertTrue(self.executor.drain(1))
+
+        self.assertTrue(self.threads[0].startswith('post_process'))
+
+
+class ServicePhaseTimedTest(TestCase):
+
+    def setUp(self):
+        self.events = []
+        service_phase_timed.connect(self.receiver)
+        self.addCleanup(service_phase_timed.disconnect, self.receiver)
+
+    def receiver(self, sender, phase, duration, using, outcome, exception,
+                 **kwargs):
+        self.assertGreaterEqual(duration, 0)
+        self.events.append((sender, phase, using, outcome, exception))
+
+    def test_success(self):
+        CreateFooService.execute({'one': 'a'})
+
+        self.assertEqual([
+            (CreateFooService, 'init', 'default', 'success', None),
+            (CreateFooService, 'clean', 'default', 'success', None),
+            (CreateFooService, 'process', 'default', 'success', None),
+            (CreateFooService, 'commit', 'default', 'success', None),
+        ], self.events)
+
+    def test_invalid(self):
+        with self.assertRaises(InvalidInputsError) as cm:
+            CreateFooService.execute({})
+
+        self.assertEqual(['init', 'clean'], [e[1] for e in self.events])
+        self.assertEqual(('invalid', cm.exception), self.events[-1][3:])
+
+    def test_process_error(self):
+        error = ValueError('boom')
+
+        with patch.object(CreateFooService, 'process',
+                          Mock(side_effect=error)):
+            with self.assertRaises(ValueError):
+                CreateFooService.execute({'one': 'a'})
+
+        self.assertEqual(['init', 'clean', 'process'],
+                         [e[1] for e in self.events])
+        self.assertEqual(('error', error), self.events[-1][3:])
+
+    def test_post_process(self):
+        class PostProcessService(Service):
+            db_transaction = False
+
+            def process(self):
+                pass
+
+        PostProcessService.execute({})
+
+        self.assertEqual(['init', 'clean', 'process', 'post_process'],
+                         [e[1] for e in self.events])
+
+    def test_deferred_post_process(self):
+        with patch('django.db.transaction.on_commit') as on_commit:
+            CreateFooService.execute({'one': 'a'})
+            self.assertEqual(4, len(self.events))
+
+            on_commit.call_args[0][0]()
+
+        self.assertEqual(
+            (CreateFooService, 'post_process', 'default', 'success', None),
+            self.events[-1])
+
+    def test_not_timed_without_receivers(self):
+        service_phase_timed.disconnect(self.receiver)
+
+        with patch.object(PhaseTimer, 'send') as send:
+            CreateFooService.execute({'one': 'a'})
+
+        send.assert_not_called()
+
+
+class AsyncProcessService(Service):
+    db_transaction = False
+
+    one = forms.CharField(max_length=1)
+
+    async def process(self):
+        self.calls = ['process']
+        return self.cleaned_data['one']
+
+    async def post_process(self):
+        self.calls.append('post_process')
+
+
+class AsyncExecuteTest(TestCase):
+
+    def test_sync_process(self):
+        foo = async_to_sync(CreateFooService.aexecute)({'one': 'a'})
+
+        self.assertEqual('a', foo.one)
+        self.assertEqual(1, FooModel.objects.count())
+
+    def test_async_process(self):
+        calls = []
+
+        def post_process(_self):
+            calls.extend(_self.calls + ['done'])
+
+        self.assertEqual(
+            'a', async_to_sync(AsyncProcessService.aexecute)({'one': 'a'}))
+
+        with patch.object(AsyncProcessService, 'post_process',
+                          post_process):
+            async_to_sync(AsyncProcessService.aexecute)({'one': 'a'})
+        self.assertEqual(['process', 'done'], calls)
+
+    def test_async_post_process(self):
+        calls = []
+
+        async def post_process(_self):
+            calls.append(_self.cleaned_data['one'])
+
+        with patch.object(AsyncProcessService, 'post_process',
+                          post_process):
+            async_to_sync(AsyncProcessService.aexecute)({'one': 'a'})
+        self.assertEqual(['a'], calls)
+
+    def test_async_post_process_from_execute(self):
+        calls = []
+
+        class SyncService(Service):
+            db_transaction = False
+
+            def process(self):
+                pass
+
+            async def post_process(self):
+                calls.append('post_process')
+
+        SyncService.execute({})
+        self.assertEqual(['post_process'], calls)
+
+    def test_async_post_process_from_execute_many(self):
+        calls = []
+
+        class SyncService(Service):
+            db_transaction = False
+
+            one = forms.CharField()
+
+            def process(self):
+                pass
+
+            async def post_process(self):
+                calls.append(self.cleaned_data['one'])
+
+        list(SyncService.execute_many([{'one': 'a'}, {'one': 'b'}]))
+        self.assertEqual(['a', 'b'], calls)
+
+    def test_invalid_inputs(self):
+        with self.assertRaises(InvalidInputsError):
+            async_to_sync(AsyncProcessService.aexecute)({})
+        with self.assertRaises(InvalidInputsError):
+            async_to_sync(CreateFooService.aexecute)({})
+
+    def test_async_process_in_transaction(self):
+        class TransactionService(AsyncProcessService):
+            db_transaction = True
+
+        with self.assertRaises(ImproperlyConfigured):
+            async_to_sync(TransactionService.aexecute)({'one': 'a'})
+
+    def test_async_process_read_only(self):
+        class ReadOnlyService(AsyncProcessService):
+            db_transaction = True
+            read_only = True
+            replicas = ['replica']
+
+            async def process(self):
+                self.calls = []
+                return _read_database.get()
+
+        self.assertEqual(
+            'replica', async_to_sync(ReadOnlyService.aexecute)({'one': 'a'}))
+
+
 class ModelServiceTest(TestCase):
 
     def test_auto_fields(self):
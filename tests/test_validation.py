@@ -0,0 +1,229 @@
+import datetime
+
+from django import forms
+from django.test import TestCase
+
+from service_objects.errors import InvalidInputsError
+from service_objects.fields import DictField, ModelField, MultipleFormField
+from service_objects.services import Service, ModelService
+from service_objects.validation import compile_validator, CompiledValidator
+from tests.forms import FooForm
+from tests.models import FooModel
+
+
+class ParityService(Service):
+    name = forms.CharField(max_length=5)
+    count = forms.IntegerField(min_value=0, required=False)
+    flag = forms.BooleanField(required=False)
+    color = forms.ChoiceField(choices=[('r', 'Red'), ('g', 'Green')])
+    sizes = forms.MultipleChoiceField(
+        choices=[('s', 'S'), ('m', 'M')], required=False)
+    when = forms.DateField(required=False)
+    foo = ModelField(FooModel, required=False)
+    context = DictField(required=False)
+    items = MultipleFormField(FooForm, required=False)
+
+    def clean_name(self):
+        name = self.cleaned_data['name']
+        if name == 'admin':
+            raise forms.ValidationError('Reserved name.')
+        return name.upper()
+
+    def clean(self):
+        cleaned_data = super(ParityService, self).clean()
+        if cleaned_data.get('count') == 13:
+            raise forms.ValidationError('Unlucky.')
+        return cleaned_data
+
+    def process(self):
+        return self.cleaned_data
+
+
+class OptionalNameService(ParityService):
+
+    def adjust_fields(self):
+        self.fields['name'].required = False
+        self.fields['color'].choices = [('b', 'Blue')]
+
+    def service_clean(self):
+        self.adjust_fields()
+        super(OptionalNameService, self).service_clean()
+
+
+class ParityTest(TestCase):
+
+    def setUp(self):
+        self.foo = FooModel.objects.create(one='a')
+
+    def assertParity(self, inputs, service_class=ParityService):
+        compiled = service_class(inputs)
+        try:
+            compiled.service_clean()
+        except InvalidInputsError:
+            pass
+
+        regular = service_class(inputs)
+        if hasattr(regular, 'adjust_fields'):
+            regular.adjust_fields()
+        regular.is_valid()
+
+        self.assertEqual(regular.errors.get_json_data(),
+                         compiled.errors.get_json_data())
+        self.assertEqual(regular.non_field_errors(),
+                         compiled.non_field_errors())
+        self.assertEqual(self.normalize(regular.cleaned_data),
+                         self.normalize(compiled.cleaned_data))
+        self.assertEqual(list(regular.cleaned_data),
+                         list(compiled.cleaned_data))
+
+    def normalize(self, cleaned_data):
+        # MultipleFormField returns new Form instances on every clean
+        return {
+            name: ([form.cleaned_data for form in value]
+                   if name == 'items' else value)
+            for name, value in cleaned_data.items()
+        }
+
+    def test_uses_compiled_validator(self):
+        self.assertIsInstance(ParityService._validator, CompiledValidator)
+        self.assertEqual(
+            ('name', 'count', 'flag', 'color', 'sizes', 'when', 'foo',
+             'context', 'items'),
+            ParityService._validator.names)
+
+    def test_valid(self):
+        self.assertParity({
+            'name': 'john',
+            'count': '3',
+            'flag': 'false',
+            'color': 'g',
+            'sizes': ['s', 'm'],
+            'when': datetime.date(2020, 1, 1),
+            'foo': self.foo,
+            'context': {'a': 1},
+            'items': [{'name': 'x'}],
+        })
+
+    def test_minimal(self):
+        self.assertParity({'name': 'john', 'color': 'r'})
+
+    def test_empty(self):
+        self.assertParity({})
+
+    def test_field_errors(self):
+        self.assertParity({
+            'name': 'toolong',
+            'count': '-1',
+            'color': 'b',
+            'sizes': ['x'],
+            'when': 'not a date',
+            'foo': FooModel(one='b'),
+            'context': 'not a dict',
+            'items': [{'name': ''}],
+        })
+
+    def test_clean_hook_error(self):
+        self.assertParity({'name': 'admin', 'color': 'r'})
+
+    def test_non_field_error(self):
+        self.assertParity({'name': 'john', 'color': 'r', 'count': 13})
+
+    def test_execute(self):
+        cleaned_data = ParityService.execute({'name': 'name', 'color': 'r'})
+        self.assertEqual('NAME', cleaned_data['name'])
+
+        with self.assertRaises(InvalidInputsError) as cm:
+            ParityService.execute({'name': 'admin', 'color': 'r'})
+        self.assertEqual(['Reserved name.'], cm.exception.errors['name'])
+
+    def test_instance_fields(self):
+        self.assertIsNotNone(OptionalNameService._validator)
+        self.assertParity({}, OptionalNameService)
+        self.assertParity({'color': 'b'}, OptionalNameService)
+        self.assertParity({'color': 'r'}, OptionalNameService)
+
+        cleaned_data = OptionalNameService.execute({'color': 'b'})
+        self.assertEqual('', cleaned_data['name'])
+
+    def test_disabled_instance_field_falls_back(self):
+        service = ParityService({'name': 'john', 'color': 'r'})
+        service.fields['count'].disabled = True
+
+        self.assertFalse(ParityService._validator.applies_to(service))
+
+    def test_prefix_falls_back(self):
+        service = ParityService({'p-name': 'john', 'p-color': 'r'},
+                                prefix='p')
+
+        self.assertFalse(ParityService._validator.applies_to(service))
+        service.service_clean()
+        self.assertEqual('JOHN', service.cleaned_data['name'])
+
+    def test_changed_fields_fall_back(self):
+        service = ParityService({'name': 'john', 'color': 'r'})
+        del service.fields['items']
+
+        self.assertFalse(ParityService._validator.applies_to(service))
+        service.service_clean()
+        self.assertNotIn('items', service.cleaned_data)
+
+
+class CompileValidatorTest(TestCase):
+
+    def test_file_field(self):
+        class FileService(Service):
+            upload = forms.FileField()
+
+            def process(self):
+                pass
+
+        self.assertIsNone(FileService._validator)
+
+    def test_disabled_field(self):
+        class DisabledService(Service):
+            name = forms.CharField(disabled=True)
+
+            def process(self):
+                pass
+
+        self.assertIsNone(DisabledService._validator)
+
+    def test_custom_init(self):
+        class InitService(Service):
+            name = forms.CharField()
+
+            def __init__(self, *args, **kwargs):
+                super(InitService, self).__init__(*args, **kwargs)
+                self.fields['name'].required = False
+
+            def process(self):
+                pass
+
+        self.assertIsNone(InitService._validator)
+        InitService.execute({})
+
+    def test_model_service(self):
+        class FooModelService(ModelService):
+            class Meta:
+                model = FooModel
+                fields = '__all__'
+
+            def process(self):
+                return self.cleaned_data
+
+        self.assertEqual(('one',), FooModelService._validator.names)
+        self.assertEqual({'one': 'a'}, FooModelService.execute({'one': 'a'}))
+
+    def test_disabled_by_flag(self):
+        class SlowService(Service):
+            fast_validation = False
+
+            def process(self):
+                pass
+
+        self.assertIsNone(SlowService._validator)
+
+    def test_plain_form(self):
+        validator = compile_validator(FooForm)
+
+        self.assertEqual(('name',), validator.names)
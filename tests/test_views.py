@@ -1,14 +1,18 @@
+import asyncio
+
 try:
-    from unittest.mock import MagicMock, PropertyMock, patch, call
+    from unittest.mock import (AsyncMock, MagicMock, PropertyMock, patch,
+                               call)
 except ImportError:
-    from mock import MagicMock, PropertyMock, patch, call
+    from mock import AsyncMock, MagicMock, PropertyMock, patch, call
 
 from unittest import TestCase
 
+from asgiref.sync import async_to_sync
 from django.core.exceptions import ValidationError, NON_FIELD_ERRORS
 
 from service_objects.errors import InvalidInputsError
-from service_objects.views import ServiceView
+from service_objects.views import AsyncServiceView, ServiceView
 
 MockService = MagicMock()
 
@@ -187,3 +191,87 @@ class ViewTest(TestCase):
 
         form_valid.assert_called_once_with(form)
         form_invalid.assert_not_called()
+
+
+AsyncService = MagicMock()
+AsyncService.aexecute = AsyncMock()
+
+AsyncInvalidInputsErrorService = MagicMock()
+AsyncInvalidInputsErrorService.aexecute = AsyncMock(side_effect=invalid_inputs)
+
+
+class AsyncView(AsyncServiceView):
+    service_class = AsyncService
+
+
+class AsyncInvalidInputsErrorView(AsyncServiceView):
+    service_class = AsyncInvalidInputsErrorService
+
+
+class AsyncViewTest(TestCase):
+
+    def test_view_is_async(self):
+        self.assertTrue(AsyncView.view_is_async)
+
+    @patch('django.views.generic.FormView.form_valid')
+    @patch('django.views.generic.FormView.form_invalid')
+    def test_aform_valid_good(self, form_invalid, form_valid):
+        request = MagicMock(method='POST', FILES={})
+        form = MagicMock()
+
+        view = AsyncView()
+        view.request = request
+        async_to_sync(view.aform_valid)(form)
+
+        AsyncService.aexecute.assert_awaited_once_with(
+            form.cleaned_data, {})
+        form_valid.assert_called_once_with(form)
+        form_invalid.assert_not_called()
+
+    @patch('django.views.generic.FormView.form_valid')
+    @patch('django.views.generic.FormView.form_invalid')
+    def test_aform_valid_invalid_inputs_error(self, form_invalid,
+                                              form_valid):
+        request = MagicMock(method='GET')
+        form = MagicMock()
+
+        view = AsyncInvalidInputsErrorView()
+        view.request = request
+        async_to_sync(view.aform_valid)(form)
+
+        form_valid.assert_not_called()
+        form_invalid.assert_called_once_with(form)
+        form.add_error.assert_has_calls([
+            call(NON_FIELD_ERRORS, [non_field_error]),
+            call('field1', [field1_error])
+            ], any_order=True)
+
+    def test_post_validates_outside_event_loop(self):
+        form = MagicMock()
+
+        def is_valid():
+            with self.assertRaises(RuntimeError):
+                asyncio.get_running_loop()
+            return False
+
+        form.is_valid.side_effect = is_valid
+        view = AsyncView()
+        view.form_invalid = MagicMock(return_value='invalid')
+        with patch.object(AsyncView, 'get_form', return_value=form):
+            rv = async_to_sync(view.post)(MagicMock())
+
+        self.assertEqual('invalid', rv)
+        form.is_valid.assert_called_once_with()
+
+    def test_post(self):
+        form = MagicMock()
+        form.is_valid.return_value = True
+
+        view = AsyncView()
+        view.aform_valid = AsyncMock(return_value='response')
+        with patch.object(AsyncView, 'get_form', return_value=form):
+            rv = async_to_sync(view.post)(MagicMock())
+
+        self.assertEqual('response', rv)
+        view.aform_valid.assert_awaited_once_with(form)
+